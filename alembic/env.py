@@ -12,12 +12,15 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Callers running migrations programmatically may keep their logging configuration
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
     fileConfig(config.config_file_name)
 
-config.set_main_option(
-    "sqlalchemy.url", f"{api_settings.DATABASE_URL}?async_fallback=True"
-)
+# `database_url` attribute is set by callers migrating another database, e.g. tests
+database_url = config.attributes.get("database_url", api_settings.DATABASE_URL)
+config.set_main_option("sqlalchemy.url", f"{database_url}?async_fallback=True")
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -0,0 +1,90 @@
+"""
+Test databases of pytest processes.
+
+Migrations are applied once per test session to a template database. Each pytest-xdist
+worker, or the only pytest process without `-n`, runs tests in its own copy of it made
+with `CREATE DATABASE ... TEMPLATE`, which copies the database files instead of
+running migrations again.
+
+This conftest is loaded before `tests`, so engines of `src.database` are created
+with the database of the current process.
+"""
+
+import asyncio
+import os
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from alembic import command
+from src.api_config import api_settings
+
+MAINTENANCE_DATABASE_URL = api_settings.DATABASE_URL
+TEMPLATE_DATABASE = f"{api_settings.POSTGRES_DB}_template"
+WORKER_DATABASE = (
+    f"{api_settings.POSTGRES_DB}_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+)
+
+api_settings.POSTGRES_DB = WORKER_DATABASE
+
+
+def _database_url(database: str) -> str:
+    return (
+        make_url(MAINTENANCE_DATABASE_URL)
+        .set(database=database)
+        .render_as_string(hide_password=False)
+    )
+
+
+def _execute(*statements: str) -> None:
+    """Execute `statements` in the maintenance database outside of a transaction."""
+
+    async def execute() -> None:
+        engine = create_async_engine(
+            MAINTENANCE_DATABASE_URL, isolation_level="AUTOCOMMIT", poolclass=NullPool
+        )
+        async with engine.connect() as conn:
+            for statement in statements:
+                await conn.execute(text(statement))
+        await engine.dispose()
+
+    # `asyncio.run` would unset the event loop of the main thread used by pytest-asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(execute())
+    finally:
+        loop.close()
+
+
+def _runs_tests(config: pytest.Config) -> bool:
+    """Return `False` for the pytest-xdist controller that only distributes tests."""
+
+    return hasattr(config, "workerinput") or config.getoption("dist", "no") == "no"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not hasattr(config, "workerinput"):
+        _execute(
+            f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE}" WITH (FORCE)',
+            f'CREATE DATABASE "{TEMPLATE_DATABASE}"',
+        )
+        alembic_config = Config("alembic.ini")
+        alembic_config.attributes["database_url"] = _database_url(TEMPLATE_DATABASE)
+        alembic_config.attributes["configure_logger"] = False
+        command.upgrade(alembic_config, "heads")
+
+    if _runs_tests(config):
+        _execute(
+            f'DROP DATABASE IF EXISTS "{WORKER_DATABASE}" WITH (FORCE)',
+            f'CREATE DATABASE "{WORKER_DATABASE}" TEMPLATE "{TEMPLATE_DATABASE}"',
+        )
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if _runs_tests(config):
+        _execute(f'DROP DATABASE IF EXISTS "{WORKER_DATABASE}" WITH (FORCE)')
+    if not hasattr(config, "workerinput"):
+        _execute(f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE}" WITH (FORCE)')
@@ -0,0 +1,82 @@
+import asyncio
+import heapq
+import itertools
+
+__all__ = ["AdmissionController"]
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded priority wait queue.
+
+    A released slot is handed over to the waiter with the highest priority,
+    the earliest one among equal priorities.
+
+    Attributes:
+        limit (int): maximum number of concurrent holders of a slot.
+        queue_size (int): maximum number of waiters, more are rejected immediately.
+        queue_timeout (float): maximum wait for a slot in seconds.
+        active (int): number of holders of a slot.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._queued = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Number of waiters."""
+
+        return self._queued
+
+    async def acquire(self, priority: int = 0) -> bool:
+        """
+        Wait for a slot, `release` must be called for every successful acquire.
+
+        Args:
+            priority(int): waiters with a higher priority get a slot first.
+
+        Returns:
+            bool: `False` if the queue is full or the wait timed out.
+        """
+
+        if self.active < self.limit and not self._queued:
+            self.active += 1
+            return True
+        elif self._queued >= self.queue_size:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._counter), future))
+        self._queued += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as ex:
+            if future.done() and not future.cancelled():
+                # The slot was handed over right before the timeout or cancellation
+                self.release()
+            else:
+                future.cancel()
+                self._queued -= 1
+            if isinstance(ex, TimeoutError):
+                return False
+            raise
+        return True
+
+    def release(self) -> None:
+        """Hand the slot over to the next waiter or free it."""
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._queued -= 1
+                future.set_result(None)
+                return
+
+        self.active -= 1
@@ -0,0 +1,136 @@
+from typing import Any
+
+from fastapi import Request, Response
+
+from src.api_exceptions import NotModifiedException
+
+__all__ = ["CacheControl", "ConditionalRequest", "etag_matches", "weak_etag"]
+
+
+# MARK: ETag
+def weak_etag(version: Any) -> str:
+    """Return a weak `ETag` header value of `version`."""
+
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether `If-None-Match` header value matches `etag` by weak comparison.
+
+    Args:
+        if_none_match(str | None): `If-None-Match` request header value.
+        etag(str): `ETag` of the current representation.
+
+    Returns:
+        bool: `True` if the client's cached representation is still current.
+    """
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
+
+
+# MARK: Cache-Control
+class ConditionalRequest:
+    """
+    Conditional request state of a route declaring `CacheControl`.
+
+    Attributes:
+        request (Request): current request.
+        response (Response): response FastAPI copies headers from.
+        headers (dict[str, str]): caching headers of the response,
+            pass them to a `Response` returned from the route.
+    """
+
+    def __init__(
+        self, request: Request, response: Response, cache_control: str
+    ) -> None:
+        self.request = request
+        self.response = response
+        self.headers = {"Cache-Control": cache_control}
+        response.headers["Cache-Control"] = cache_control
+
+    def check(self, version: Any) -> None:
+        """
+        Set `ETag` of `version` and answer `If-None-Match` of the client.
+
+        Call it with a cheap version lookup, e.g. `BaseRepository.get_version`,
+        before loading and serializing the data of the response.
+
+        Args:
+            version(Any): value changing with each change of the response data,
+                `None` if there is no data, e.g. before raising a not found exception.
+
+        Raises:
+            NotModifiedException: the client's cached representation is current.
+        """
+
+        if version is None:
+            return
+
+        etag = weak_etag(version)
+        self.headers["ETag"] = etag
+        self.response.headers["ETag"] = etag
+        if etag_matches(self.request.headers.get("If-None-Match"), etag):
+            raise NotModifiedException(headers=self.headers)
+
+
+class CacheControl:
+    """
+    Dependency declaring `Cache-Control` policy of a route.
+
+    Usage:
+        ```
+        item_cache_control = CacheControl(max_age=10)
+
+        @router.get(path="/{item_id}")
+        async def get_item(
+            item_id: uuid.UUID,
+            session: AsyncSession = Depends(get_session),
+            conditional: ConditionalRequest = Depends(item_cache_control),
+        ) -> ItemReadSchema:
+            conditional.check(
+                await ItemRepository.get_version(Item.id == item_id, session=session)
+            )
+            ...
+        ```
+
+    Attributes:
+        max_age (int): seconds the response is fresh for in client caches.
+        private (bool): only the client may cache the response, not shared caches.
+        no_cache (bool): clients must revalidate the response before each use.
+        stale_while_revalidate (int | None): seconds a stale response may be used
+            while it is revalidated in the background.
+        header (str): `Cache-Control` header value.
+    """
+
+    def __init__(
+        self,
+        max_age: int = 0,
+        private: bool = True,
+        no_cache: bool = False,
+        stale_while_revalidate: int | None = None,
+    ) -> None:
+        self.max_age = max_age
+        self.private = private
+        self.no_cache = no_cache
+        self.stale_while_revalidate = stale_while_revalidate
+
+        directives = ["private" if private else "public", f"max-age={max_age}"]
+        if no_cache:
+            directives.append("no-cache")
+        if stale_while_revalidate is not None:
+            directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+        self.header = ", ".join(directives)
+
+    async def __call__(
+        self, request: Request, response: Response
+    ) -> ConditionalRequest:
+        return ConditionalRequest(request, response, self.header)
@@ -0,0 +1,136 @@
+import importlib
+import zlib
+from typing import Any, Protocol
+
+from src import api_constants
+
+__all__ = [
+    "Compressor",
+    "available_encodings",
+    "create_compressor",
+    "negotiate_encoding",
+]
+
+
+def _import_optional(name: str) -> Any:
+    """Return module `name` or `None` if it isn't installed."""
+
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# Optional encoders of the `compression` extra
+brotli = _import_optional("brotli")
+zstandard = _import_optional("zstandard")
+
+
+# MARK: Compressors
+class Compressor(Protocol):
+    """Streaming compressor of a response body."""
+
+    def compress(self, data: bytes, last: bool = False) -> bytes:
+        """
+        Compress a chunk of the body.
+
+        Everything compressed so far is returned, so the client can decode the chunk
+        without waiting for the next ones. The compressed body ends with the `last` chunk.
+        """
+        ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, last: bool = False) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+        )
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, last: bool = False) -> bytes:
+        return self._compressor.process(data) + (
+            self._compressor.finish() if last else self._compressor.flush()
+        )
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, last: bool = False) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if last
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return supported content encodings in the order of preference."""
+
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return tuple(
+        encoding
+        for encoding in api_constants.COMPRESSION_ENCODINGS
+        if installed[encoding]
+    )
+
+
+def create_compressor(encoding: str, levels: dict[str, int]) -> Compressor:
+    """
+    Return a new compressor of `encoding`.
+
+    Args:
+        encoding(str): one of `available_encodings`.
+        levels(dict[str, int]): compression level (quality for `br`) of each encoding.
+
+    Returns:
+        Compressor: streaming compressor.
+    """
+
+    if encoding == "zstd":
+        return _ZstdCompressor(levels[encoding])
+    elif encoding == "br":
+        return _BrotliCompressor(levels[encoding])
+    return _GzipCompressor(levels[encoding])
+
+
+# MARK: Negotiation
+def negotiate_encoding(
+    accept_encoding: str | None, encodings: tuple[str, ...]
+) -> str | None:
+    """
+    Choose a content encoding accepted by the client.
+
+    Args:
+        accept_encoding(str | None): `Accept-Encoding` request header value.
+        encodings(tuple[str, ...]): supported encodings in the order of preference.
+
+    Returns:
+        str | None: the most preferred encoding accepted with a non-zero quality,
+            or `None` if the body should be sent as it is.
+    """
+
+    if not accept_encoding:
+        return None
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        encoding, _, params = item.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params else 1.0
+        except ValueError:
+            continue
+        qualities[encoding.strip()] = quality
+
+    for encoding in encodings:
+        if qualities.get(encoding, qualities.get("*", 0)) > 0:
+            return encoding
+    return None
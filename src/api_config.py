@@ -26,6 +26,49 @@ class ApiSettings(BaseSettings):
     POSTGRES_PORT: str
     POOL_SIZE: int
     MAX_OVERFLOW: int
+    POOL_WARM_UP: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000  # 0 disables the timeout
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # 0 disables the cache
+    DB_POOLER_PREPARED_STATEMENTS: bool = False  # unique statement names for a pooler
+
+    # Admission control
+    ADMISSION_MAX_CONCURRENCY: int | None = None  # POOL_SIZE + MAX_OVERFLOW if not set
+    ADMISSION_QUEUE_SIZE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_ROUTE_PRIORITIES: dict[str, int] = {}
+    ADMISSION_EXEMPT_PATHS: list[str] = ["/api/v1/healthcheck", "/api/v1/metrics"]
+
+    # Readiness
+    READINESS_CACHE_TTL: float = 1.0
+    READINESS_TIMEOUT: float = 2.0
+    READINESS_MAX_POOL_USAGE: float = 0.95
+    READINESS_MAX_REPLICA_LAG: float = 30.0
+    READINESS_MAX_EVENT_LOOP_LAG: float = 0.5
+
+    # Shutdown
+    DRAIN_TIMEOUT: float = 30.0
+
+    # Postgres read replicas
+    POSTGRES_REPLICA_HOSTS: list[str] = []
+    REPLICA_SELECTION: Literal["round_robin", "least_busy"] = "round_robin"
+
+    # Responses
+    RESPONSE_ETAGS: bool = False  # ETags from a hash of GET response bodies
+    RESPONSE_COMPRESSION: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Instrumentation
+    DB_INSTRUMENTATION: bool = True
+    DB_N_PLUS_ONE_THRESHOLD: int = 20  # 0 disables the N+1 query warning
 
     @property
     def DATABASE_URL(self) -> str:
@@ -36,6 +79,23 @@ class ApiSettings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ADMISSION_CONCURRENCY_LIMIT(self) -> int:
+        """Maximum number of concurrent requests of a worker."""
+
+        return self.ADMISSION_MAX_CONCURRENCY or self.POOL_SIZE + self.MAX_OVERFLOW
+
+    @property
+    def REPLICA_DATABASE_URLS(self) -> list[str]:
+        """PostgreSQL read replica URLs, `POSTGRES_PORT` is used if a host has no port."""
+
+        return [
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{host if ':' in host else f'{host}:{self.POSTGRES_PORT}'}"
+            f"/{self.POSTGRES_DB}"
+            for host in self.POSTGRES_REPLICA_HOSTS
+        ]
+
     model_config = SettingsConfigDict(env_file=api_constants.ENV_PATH, extra="allow")
 
 
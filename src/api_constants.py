@@ -15,6 +15,34 @@ DB_NAMING_CONVENTION: dict[str, str] = {
     "pk": "%(table_name)s_pkey",
 }
 POOL_RECYCLE: int = 3600
+READ_REPLICA_OPTION: str = "read_replica"
+READ_ONLY_SESSION_INFO: str = "read_only"
+PINNED_TO_PRIMARY_INFO: str = "pinned_to_primary"
+REPLICA_ENGINE_INFO: str = "replica_engine"
+LOADERS_SESSION_INFO: str = "loaders"
+LOADERS_LOCK_SESSION_INFO: str = "loaders_lock"
+STATEMENT_DEADLINE_CONNECTION_INFO: str = "statement_deadline"
+QUERY_CANCELED_SQLSTATE: str = "57014"
 CURRENT_TIMESTAMP_UTC: TextClause = text("(CURRENT_TIMESTAMP AT TIME ZONE 'UTC')")
 DEFAULT_QUERY_OFFSET: int = 0
 DEFAULT_QUERY_LIMIT: int = 100
+DEFAULT_COUNT_EXACT_THRESHOLD: int = 100_000
+DEFAULT_STREAM_YIELD_PER: int = 1000
+DEFAULT_COPY_CHUNK_SIZE: int = 10_000
+DEFAULT_BATCH_SIZE: int = 1000
+POSTGRES_MAX_BIND_PARAMS: int = 32767
+
+# MARK: Cache
+CACHE_MAX_SIZE: int = 1024
+CACHE_TTL: float = 60.0
+CACHE_INVALIDATION_CHANNEL: str = "repository_cache_invalidation"
+CACHE_NOTIFY_MAX_PAYLOAD: int = 7900
+
+# MARK: Write buffer
+WRITE_BUFFER_MAX_ROWS: int = 500
+WRITE_BUFFER_MAX_DELAY: float = 0.05
+
+# MARK: Responses
+STREAM_CHUNK_SIZE: int = 64 * 1024
+DISCONNECT_RECEIVE_QUEUE_SIZE: int = 16
+COMPRESSION_ENCODINGS: tuple[str, ...] = ("zstd", "br", "gzip")  # by preference
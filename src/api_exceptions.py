@@ -2,6 +2,19 @@ from fastapi import HTTPException, status
 
 
 # MARK: Base
+class BaseNotModifiedException(HTTPException):
+    """Base `HTTP_304_NOT_MODIFIED` exception."""
+
+    default_message = "Not modified"
+
+    def __init__(self, headers: dict[str, str] | None = None):
+        status_code = status.HTTP_304_NOT_MODIFIED
+
+        super().__init__(
+            status_code=status_code, detail=self.default_message, headers=headers
+        )
+
+
 class BaseBadRequestException(HTTPException):
     """Base `HTTP_400_BAD_REQUEST` exception."""
 
@@ -55,3 +68,57 @@ class BaseConflictException(HTTPException):
         status_code = status.HTTP_409_CONFLICT
 
         super().__init__(status_code=status_code, detail=self.default_message)
+
+
+class BaseServiceUnavailableException(HTTPException):
+    """Base `HTTP_503_SERVICE_UNAVAILABLE` exception."""
+
+    default_message = "Service unavailable"
+
+    def __init__(self):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+        super().__init__(status_code=status_code, detail=self.default_message)
+
+
+class BaseGatewayTimeoutException(HTTPException):
+    """Base `HTTP_504_GATEWAY_TIMEOUT` exception."""
+
+    default_message = "Gateway timeout"
+
+    def __init__(self):
+        status_code = status.HTTP_504_GATEWAY_TIMEOUT
+
+        super().__init__(status_code=status_code, detail=self.default_message)
+
+
+# MARK: Pagination
+class InvalidCursorException(BaseBadRequestException):
+    """Raised when a pagination cursor can not be decoded."""
+
+    default_message = "Invalid pagination cursor"
+
+
+# MARK: Caching
+class NotModifiedException(BaseNotModifiedException):
+    """Raised when the client's cached representation matches `If-None-Match`."""
+
+
+# MARK: Lifecycle
+class AppNotReadyException(BaseServiceUnavailableException):
+    """Raised when the app is warming up or draining requests before shutdown."""
+
+    default_message = "App is not ready"
+
+
+class ServerOverloadedException(BaseServiceUnavailableException):
+    """Raised when the app has too many requests in flight and queued."""
+
+    default_message = "Server is overloaded, retry later"
+
+
+# MARK: Database
+class DeadlineExceededException(BaseGatewayTimeoutException):
+    """Raised when a statement can't finish before the deadline of the request."""
+
+    default_message = "Database deadline exceeded"
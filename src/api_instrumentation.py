@@ -0,0 +1,164 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import AsyncAdaptedQueuePool, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from src.api_config import api_settings
+from src.metrics.collectors import (
+    POOL_CHECKED_OUT,
+    POOL_CHECKOUT_WAIT,
+    POOL_OVERFLOW,
+    POOL_SIZE,
+)
+
+__all__ = [
+    "InstrumentedQueuePool",
+    "RequestDBStats",
+    "instrument_engine",
+    "request_db_stats",
+]
+
+logger = logging.getLogger(__name__)
+
+_BIND_PARAMS_PATTERN = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+
+
+# MARK: Stats
+class RequestDBStats:
+    """
+    Database usage of a single request.
+
+    Attributes:
+        statements (int): number of executed statements.
+        db_time (float): total execution time of statements in seconds.
+        pool_wait_time (float): total time spent waiting for a pool connection in seconds.
+        slowest_time (float): execution time of the slowest statement in seconds.
+        slowest_statement (str | None): SQL of the slowest statement.
+        statement_shapes (Counter[str]): number of executions of each statement shape.
+    """
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+        self.statement_shapes: Counter[str] = Counter()
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        """Record an executed statement and warn about a possible N+1 query."""
+
+        self.statements += 1
+        self.db_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+        shape = _BIND_PARAMS_PATTERN.sub("$?", statement)
+        self.statement_shapes[shape] += 1
+        threshold = api_settings.DB_N_PLUS_ONE_THRESHOLD
+        if threshold and self.statement_shapes[shape] == threshold + 1:
+            logger.warning(
+                "Possible N+1 query: statement executed more than %s times "
+                "in one request: %s",
+                threshold,
+                shape,
+            )
+
+    def record_pool_wait(self, duration: float) -> None:
+        """Record time spent waiting for a pool connection."""
+
+        self.pool_wait_time += duration
+
+    def server_timing(self) -> str:
+        """Return the value of `Server-Timing` header."""
+
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} statements", '
+            f"db-pool;dur={self.pool_wait_time * 1000:.2f}, "
+            f"db-slowest;dur={self.slowest_time * 1000:.2f}"
+        )
+
+    def log_fields(self) -> dict[str, Any]:
+        """Return stats as structured log fields."""
+
+        return {
+            "db_statements": self.statements,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "db_pool_wait_ms": round(self.pool_wait_time * 1000, 2),
+            "db_slowest_ms": round(self.slowest_time * 1000, 2),
+            "db_slowest_statement": self.slowest_statement,
+        }
+
+
+request_db_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+# MARK: Hooks
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` exporting its usage to metrics labeled by `pool_logging_name`
+    and recording the connection checkout wait of the current request.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_time = time.perf_counter() - started_at
+            POOL_CHECKOUT_WAIT.labels(self.logging_name).observe(wait_time)
+            stats = request_db_stats.get()
+            if stats is not None:
+                stats.record_pool_wait(wait_time)
+            self._update_metrics()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._update_metrics()
+
+    def _update_metrics(self) -> None:
+        POOL_SIZE.labels(self.logging_name).set(self.size())
+        POOL_CHECKED_OUT.labels(self.logging_name).set(self.checkedout())
+        POOL_OVERFLOW.labels(self.logging_name).set(max(self.overflow(), 0))
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if request_db_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stats = request_db_stats.get()
+    started_at = conn.info.get("query_started_at")
+    if stats is not None and started_at:
+        stats.record_statement(statement, time.perf_counter() - started_at.pop())
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statements executed by `engine` in `RequestDBStats` of the current request."""
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
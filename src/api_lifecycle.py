@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Literal
+
+__all__ = ["AppLifecycle", "AppState", "app_lifecycle"]
+
+logger = logging.getLogger(__name__)
+
+AppState = Literal["idle", "warming_up", "ready", "draining"]
+
+
+class AppLifecycle:
+    """
+    Lifecycle state of the app process and the number of requests it is processing.
+
+    The state is `idle` until the lifespan starts, so an app served without
+    the lifespan (e.g. in tests) is ready.
+
+    Attributes:
+        state (AppState): current state of the app.
+        in_flight (int): number of HTTP requests being processed.
+    """
+
+    def __init__(self) -> None:
+        self.state: AppState = "idle"
+        self.in_flight = 0
+        self._drained = asyncio.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the app accepts requests."""
+
+        return self.state not in ("warming_up", "draining")
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._drained.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._drained.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting requests and wait up to `timeout` seconds for in-flight ones."""
+
+        self.state = "draining"
+        if not self.in_flight:
+            return
+
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                "Shutting down with %s requests in flight after %s s of draining",
+                self.in_flight,
+                timeout,
+            )
+
+
+app_lifecycle = AppLifecycle()
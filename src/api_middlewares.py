@@ -0,0 +1,410 @@
+import asyncio
+import hashlib
+import logging
+import time
+
+from fastapi import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import api_constants
+from src.api_admission import AdmissionController
+from src.api_caching import etag_matches, weak_etag
+from src.api_compression import (
+    Compressor,
+    available_encodings,
+    create_compressor,
+    negotiate_encoding,
+)
+from src.api_exceptions import AppNotReadyException, ServerOverloadedException
+from src.api_instrumentation import RequestDBStats, request_db_stats
+from src.api_lifecycle import app_lifecycle
+from src.metrics.collectors import REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "CompressionMiddleware",
+    "DBTimingMiddleware",
+    "DisconnectMiddleware",
+    "ETagMiddleware",
+    "LifecycleMiddleware",
+    "MetricsMiddleware",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class DBTimingMiddleware:
+    """
+    Pure ASGI middleware collecting database usage of each HTTP request.
+
+    Adds `Server-Timing` header with the database time, the pool wait time
+    and the slowest statement time known when the response starts,
+    and logs the totals as structured fields once the response is sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        token = request_db_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_db_stats.reset(token)
+            if stats.statements:
+                logger.info(
+                    "%s %s: %s statements in %.2f ms",
+                    scope["method"],
+                    scope["path"],
+                    stats.statements,
+                    stats.db_time * 1000,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        **stats.log_fields(),
+                    },
+                )
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware exporting latency and the number of in-flight HTTP requests.
+
+    Latency is labeled by the route path template to keep the number of series bounded,
+    requests not matching any route are labeled as `unmatched`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - started_at)
+
+
+class LifecycleMiddleware:
+    """
+    Pure ASGI middleware counting in-flight HTTP requests for draining at shutdown
+    and rejecting new requests with `AppNotReadyException` response while draining.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if app_lifecycle.state == "draining":
+            exception = AppNotReadyException()
+            response = JSONResponse(
+                content={"detail": exception.detail}, status_code=exception.status_code
+            )
+            await response(scope, receive, send)
+            return
+
+        app_lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            app_lifecycle.request_finished()
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware limiting the number of concurrent HTTP requests of the worker.
+
+    Requests over the limit wait in a bounded priority queue, when it is full
+    or the wait times out they get a fast `ServerOverloadedException` response
+    with `Retry-After` header instead of waiting for a pool connection.
+
+    Attributes:
+        controller (AdmissionController): concurrency limiter.
+        route_priorities (dict[str, int]): priorities by path prefix, the longest
+            matching prefix wins, other paths have priority 0.
+        exempt_paths (list[str]): path prefixes that are never limited.
+        retry_after (int): value of `Retry-After` header in seconds.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrency: int,
+        queue_size: int,
+        queue_timeout: float,
+        route_priorities: dict[str, int],
+        exempt_paths: list[str],
+        retry_after: int,
+    ) -> None:
+        self.app = app
+        self.controller = AdmissionController(
+            limit=max_concurrency, queue_size=queue_size, queue_timeout=queue_timeout
+        )
+        self.route_priorities = sorted(
+            route_priorities.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.exempt_paths = tuple(exempt_paths)
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(self._get_priority(scope["path"])):
+            exception = ServerOverloadedException()
+            response = JSONResponse(
+                content={"detail": exception.detail},
+                status_code=exception.status_code,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    def _get_priority(self, path: str) -> int:
+        for prefix, priority in self.route_priorities:
+            if path.startswith(prefix):
+                return priority
+        return 0
+
+
+class DisconnectMiddleware:
+    """
+    Pure ASGI middleware cancelling the handler of an HTTP request when the client disconnects.
+
+    Cancellation interrupts a running query, asyncpg asks Postgres to cancel it,
+    and returns the connection to the pool instead of finishing pointless work.
+    Request messages are forwarded to the handler through a bounded queue,
+    so a client sending a large body is throttled by the handler reading it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        queue_size: int = api_constants.DISCONNECT_RECEIVE_QUEUE_SIZE,
+    ) -> None:
+        self.app = app
+        self.queue_size = queue_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=self.queue_size)
+        handler: asyncio.Future[None] = asyncio.ensure_future(
+            self.app(scope, messages.get, send)
+        )
+        disconnected = False
+
+        async def listen_for_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    handler.cancel()
+                    return
+                await messages.put(message)
+
+        listener = asyncio.create_task(listen_for_disconnect())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            logger.info(
+                "%s %s: cancelled on client disconnect", scope["method"], scope["path"]
+            )
+        finally:
+            listener.cancel()
+
+
+class ETagMiddleware:
+    """
+    Pure ASGI middleware adding a weak `ETag` from a hash of the body to `GET` responses
+    and answering a matching `If-None-Match` with an empty `304 Not Modified`.
+
+    Only `200` responses with the whole body in a single message and without `ETag`
+    are hashed, streaming responses are sent as they are. The route still loads and
+    serializes the data, use `CacheControl` to skip that with a cheap version lookup.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("If-None-Match")
+        start_message: Message | None = None
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] == status.HTTP_200_OK and "ETag" not in Headers(
+                    raw=message["headers"]
+                ):
+                    start_message = message
+                    return
+            elif message["type"] == "http.response.body" and start_message is not None:
+                start, start_message = start_message, None
+                headers = MutableHeaders(scope=start)
+                if not message.get("more_body", False):
+                    digest = hashlib.md5(message.get("body", b"")).hexdigest()
+                    headers["ETag"] = weak_etag(digest)
+                    if etag_matches(if_none_match, headers["ETag"]):
+                        start["status"] = status.HTTP_304_NOT_MODIFIED
+                        del headers["Content-Length"]
+                        del headers["Content-Type"]
+                        message = {"type": "http.response.body", "body": b""}
+                await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing response bodies with zstd, brotli or gzip.
+
+    The encoding is the most preferred one of `COMPRESSION_ENCODINGS` accepted
+    by the client, zstd and brotli need the optional `compression` dependencies.
+    Only bodies of `content_types` without `Content-Encoding` are compressed.
+    A body sent in a single message is compressed if it has at least `minimum_size`
+    bytes. Streaming bodies are compressed chunk by chunk as they are sent,
+    unless their `Content-Length` is known and less than `minimum_size`.
+
+    Attributes:
+        minimum_size (int): minimum body size to compress in bytes.
+        content_types (tuple[str, ...]): compressed media types or their prefixes,
+            e.g. `application/json` or `text/`.
+        levels (dict[str, int]): compression level (quality for `br`) by encoding.
+        encodings (tuple[str, ...]): installed encodings by preference.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        content_types: list[str],
+        levels: dict[str, int],
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = levels
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(
+                Headers(scope=scope).get("Accept-Encoding"), self.encodings
+            )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor: Compressor | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "Content-Encoding" not in headers and headers.get(
+                    "Content-Type", ""
+                ).startswith(self.content_types):
+                    start_message = message
+                    return
+            elif message["type"] == "http.response.body" and start_message is not None:
+                start, start_message = start_message, None
+                compressor = self._start(start, message, encoding)
+                if compressor is not None:
+                    message = self._compress(compressor, message)
+                    if not message["more_body"]:
+                        headers = MutableHeaders(scope=start)
+                        headers["Content-Length"] = str(len(message["body"]))
+                await send(start)
+            elif message["type"] == "http.response.body" and compressor is not None:
+                message = self._compress(compressor, message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _start(
+        self, start: Message, message: Message, encoding: str
+    ) -> Compressor | None:
+        """
+        Update headers of the `start` message for the encoded body.
+
+        Returns a compressor for the body or `None` if it's sent as it is.
+        """
+
+        headers = MutableHeaders(scope=start)
+        more_body = message.get("more_body", False)
+        size = (
+            int(headers.get("Content-Length", self.minimum_size))
+            if more_body
+            else len(message.get("body", b""))
+        )
+        if size < self.minimum_size or not size:
+            return None
+
+        headers["Content-Encoding"] = encoding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["Content-Length"]
+        # The encoded body isn't byte-for-byte the same representation
+        etag = headers.get("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return create_compressor(encoding, self.levels)
+
+    @staticmethod
+    def _compress(compressor: Compressor, message: Message) -> Message:
+        more_body = message.get("more_body", False)
+        body = compressor.compress(message.get("body", b""), last=not more_body)
+        return {"type": "http.response.body", "body": body, "more_body": more_body}
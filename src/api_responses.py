@@ -0,0 +1,187 @@
+import csv
+from typing import Any, AsyncGenerator, AsyncIterable
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants
+
+__all__ = ["FastJSONResponse", "csv_streaming_response", "ndjson_streaming_response"]
+
+
+# MARK: JSON
+class FastJSONResponse(JSONResponse):
+    """
+    `JSONResponse` serialized by `pydantic_core.to_json` instead of `json.dumps`.
+
+    Set as `default_response_class` of the app, it only speeds up rendering of the content
+    FastAPI has already passed through `jsonable_encoder`. Returned from a route directly,
+    it serializes Pydantic models, dataclasses, UUIDs and datetimes in Rust and skips both
+    the `response_model` validation and `jsonable_encoder`, so return it from routes
+    with large payloads of already-typed models.
+
+    Usage:
+        `return FastJSONResponse(ItemListReadSchema(count=count, data=items))`
+
+    Note:
+    * Fields are serialized by alias like FastAPI does.
+    * Dependencies setting `Response.status_code` or headers don't apply
+    to a returned response, pass `status_code` and `headers` to it instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, by_alias=True, inf_nan_mode="null")
+
+
+# MARK: Streaming
+class _CSVBuffer:
+    """File-like object for `csv.writer` that accumulates written rows."""
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self.size = 0
+
+    def write(self, value: str) -> None:
+        self.chunks.append(value)
+        self.size += len(value)
+
+    def pop(self) -> bytes:
+        """Return accumulated rows and clear the buffer."""
+
+        data = "".join(self.chunks).encode()
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+async def _close_after(
+    chunks: AsyncGenerator[bytes, None],
+    rows: AsyncIterable[Any],
+    session: AsyncSession | None,
+) -> AsyncGenerator[bytes, None]:
+    """Yield `chunks` and close `rows` and `session` once the body is sent or the client is gone."""
+
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+        if isinstance(rows, AsyncGenerator):
+            await rows.aclose()
+        if session is not None:
+            await session.close()
+
+
+async def _iter_ndjson(
+    rows: AsyncIterable[Any], schema: type[BaseModel]
+) -> AsyncGenerator[bytes, None]:
+    """Serialize `rows` into NDJSON chunks of about `STREAM_CHUNK_SIZE` bytes."""
+
+    chunk = bytearray()
+    async for row in rows:
+        chunk += (
+            schema.model_validate(row, from_attributes=True)
+            .model_dump_json(by_alias=True)
+            .encode()
+        )
+        chunk += b"\n"
+        if len(chunk) >= api_constants.STREAM_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def _iter_csv(
+    rows: AsyncIterable[Any], schema: type[BaseModel]
+) -> AsyncGenerator[bytes, None]:
+    """Serialize `rows` into CSV chunks of about `STREAM_CHUNK_SIZE` bytes."""
+
+    fields = list(schema.model_fields)
+    buffer = _CSVBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for row in rows:
+        data = schema.model_validate(row, from_attributes=True).model_dump(mode="json")
+        writer.writerow(data[field] for field in fields)
+        if buffer.size >= api_constants.STREAM_CHUNK_SIZE:
+            yield buffer.pop()
+    yield buffer.pop()
+
+
+def ndjson_streaming_response(
+    rows: AsyncIterable[Any],
+    schema: type[BaseModel],
+    session: AsyncSession | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Return a `StreamingResponse` with `rows` serialized as newline delimited JSON.
+
+    Rows are pulled from `rows` only when the previous chunk has been sent to the client,
+    so a slow client slows down reading from the database instead of growing memory.
+    Use with `BaseRepository.stream`.
+
+    Note:
+    * Dependencies with `yield` exit before the body is sent, so the session
+    from `get_session` checks out a connection again on the first read.
+    Pass it as `session` to close it when the body is sent or the client disconnects.
+
+    Args:
+        rows(AsyncIterable[Any]): model instances or any objects `schema` can validate.
+        schema(type[BaseModel]): Pydantic schema used to serialize each row.
+        session(AsyncSession | None): session `rows` are read with, closed after the body is sent.
+        status_code(int): response status code.
+        headers(dict[str, str] | None): additional response headers.
+
+    Returns:
+        StreamingResponse: `application/x-ndjson` response.
+    """
+
+    return StreamingResponse(
+        content=_close_after(_iter_ndjson(rows, schema), rows, session),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/x-ndjson",
+    )
+
+
+def csv_streaming_response(
+    rows: AsyncIterable[Any],
+    schema: type[BaseModel],
+    session: AsyncSession | None = None,
+    filename: str | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Return a `StreamingResponse` with `rows` serialized as CSV with a header row.
+
+    Columns are the fields of `schema` in their declaration order.
+    Has the same backpressure and `session` behaviour as `ndjson_streaming_response`.
+
+    Args:
+        rows(AsyncIterable[Any]): model instances or any objects `schema` can validate.
+        schema(type[BaseModel]): Pydantic schema used to serialize each row.
+        session(AsyncSession | None): session `rows` are read with, closed after the body is sent.
+        filename(str | None): file name for `Content-Disposition: attachment` header.
+        status_code(int): response status code.
+        headers(dict[str, str] | None): additional response headers.
+
+    Returns:
+        StreamingResponse: `text/csv` response.
+    """
+
+    headers = dict(headers or {})
+    if filename is not None:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return StreamingResponse(
+        content=_close_after(_iter_csv(rows, schema), rows, session),
+        status_code=status_code,
+        headers=headers,
+        media_type="text/csv",
+    )
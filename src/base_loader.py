@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Sequence, TypeVar
+
+from src.database import Base
+
+__all__ = ["BatchLoader"]
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+class BatchLoader(Generic[ModelType]):
+    """
+    Request-scoped loader of records by primary key in the style of DataLoader.
+
+    All `load` calls made in the same event loop tick are merged
+    into a single `load_many` call, results are memoized for the loader lifetime.
+    Get an instance with `BaseRepository.get_loader` to share it within a session.
+
+    Attributes:
+        load_many (Callable[[list[Any]], Awaitable[Sequence[ModelType]]]):
+            coroutine function loading records by a list of primary keys.
+        lock (asyncio.Lock): lock serializing queries of loaders sharing a session.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[Any]], Awaitable[Sequence[ModelType]]],
+        lock: asyncio.Lock,
+    ) -> None:
+        self.load_many = load_many
+        self.lock = lock
+        self._futures: dict[Any, asyncio.Future[ModelType | None]] = {}
+        self._batch: dict[Any, asyncio.Future[ModelType | None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def load(self, id: Any) -> asyncio.Future[ModelType | None]:
+        """
+        Return a future resolving to the record with primary key `id` or `None`.
+
+        Args:
+            id(Any): primary key of the record, must be of the primary key column type.
+
+        Returns:
+            asyncio.Future[ModelType | None]: the record or `None` if it doesn't exist.
+        """
+
+        future = self._futures.get(id)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[id] = future
+        if not self._batch:
+            loop.call_soon(self._dispatch)
+        self._batch[id] = future
+        return future
+
+    async def load_all(self, ids: Sequence[Any]) -> list[ModelType | None]:
+        """
+        Return records with primary keys `ids` in the order of `ids`.
+
+        Args:
+            ids(Sequence[Any]): primary keys of records.
+
+        Returns:
+            list[ModelType | None]: records or `None` for primary keys that don't exist.
+        """
+
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def clear(self, id: Any | None = None) -> None:
+        """Forget the memoized record with primary key `id` or all records if `id` is `None`."""
+
+        if id is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(id, None)
+
+    def _dispatch(self) -> None:
+        batch, self._batch = self._batch, {}
+        task = asyncio.get_running_loop().create_task(self._load_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(
+        self, batch: dict[Any, asyncio.Future[ModelType | None]]
+    ) -> None:
+        try:
+            async with self.lock:
+                instances = await self.load_many(list(batch))
+        except Exception as ex:
+            for id, future in batch.items():
+                if self._futures.get(id) is future:
+                    del self._futures[id]
+                if not future.done():
+                    future.set_exception(ex)
+            return
+
+        instances_by_id = {instance.id: instance for instance in instances}  # type: ignore
+        for id, future in batch.items():
+            if not future.done():
+                future.set_result(instances_by_id.get(id))
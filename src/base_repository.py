@@ -1,17 +1,197 @@
+import asyncio
+import base64
 import uuid
-from typing import Any, Generic, Literal, Tuple, Type, TypeVar, overload
-
-from pydantic import BaseModel
-from sqlalchemy import Select, delete, insert, select, update
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    ClassVar,
+    Generic,
+    Hashable,
+    Iterable,
+    Literal,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    overload,
+)
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json, to_json
+from sqlalchemy import (
+    CTE,
+    BinaryExpression,
+    BindParameter,
+    BooleanClauseList,
+    Column,
+    Delete,
+    Insert,
+    Row,
+    Select,
+    Table,
+    Text,
+    Update,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    insert,
+    inspect,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.exc import CompileError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func
-from sqlalchemy.sql._typing import _ColumnExpressionArgument
-
+from sqlalchemy.orm import InstrumentedAttribute, make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql import ColumnElement, Executable, func, operators
+from sqlalchemy.sql._typing import _ColumnExpressionArgument, _ColumnsClauseArgument
+from sqlalchemy.sql.dml import ReturningDelete, ReturningInsert
+
+from src import api_constants
+from src.api_exceptions import InvalidCursorException
+from src.base_loader import BatchLoader
+from src.cache import RepositoryCache, notify_invalidation, register_cache
 from src.database import Base
+from src.metrics.collectors import track_repository_call
+from src.write_buffer import WriteBuffer
 
 ModelType = TypeVar("ModelType", bound=Base)
+StatementType = TypeVar("StatementType", bound=Executable)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+UpsertPolicy = Literal["overwrite", "keep", "coalesce"] | ColumnElement[Any]
+RowType = Literal["row", "mapping"] | type[BaseModel]
+
+# Reads are sent to a read replica unless the session is pinned to the primary.
+_REPLICA_OPTIONS: dict[str, Any] = {api_constants.READ_REPLICA_OPTION: True}
+
+
+# MARK: Cursor
+def _encode_cursor(
+    instance: Base, sort_column: InstrumentedAttribute[Any], forward: bool
+) -> str:
+    """
+    Encode an opaque keyset pagination cursor pointing at `instance`.
+
+    Args:
+        instance(Base): the first or the last model instance of the page.
+        sort_column(InstrumentedAttribute[Any]): sort key of the page.
+        forward(bool): `True` for the next page cursor, `False` for the previous one.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+
+    payload = (
+        sort_column.key,
+        getattr(instance, sort_column.key),
+        instance.id,  # type: ignore
+        forward,
+    )
+    return base64.urlsafe_b64encode(to_json(payload)).decode()
+
+
+def _decode_cursor(
+    cursor: str,
+    sort_column: InstrumentedAttribute[Any],
+    id_column: InstrumentedAttribute[Any],
+) -> tuple[bool, Any, Any]:
+    """
+    Decode a keyset pagination cursor made by `_encode_cursor`.
+
+    Args:
+        cursor(str): URL-safe cursor.
+        sort_column(InstrumentedAttribute[Any]): sort key of the page.
+        id_column(InstrumentedAttribute[Any]): primary key of the model.
+
+    Raises:
+        InvalidCursorException: cursor is malformed or made for another sort key.
+
+    Returns:
+        tuple[bool, Any, Any]: direction, sort key value and primary key value.
+    """
+
+    try:
+        key, sort_value, id_value, forward = from_json(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        if key != sort_column.key or not isinstance(forward, bool):
+            raise ValueError(key)
+        sort_value = TypeAdapter(sort_column.type.python_type).validate_python(
+            sort_value
+        )
+        id_value = TypeAdapter(id_column.type.python_type).validate_python(id_value)
+    except (ValueError, TypeError, ValidationError) as ex:
+        raise InvalidCursorException() from ex
+
+    return forward, sort_value, id_value
+
+
+# MARK: Projections
+def _convert_row(row: Row[Any], row_type: RowType) -> Any:
+    """
+    Convert a row of a column projection to `row_type`.
+
+    Projections skip ORM hydration, the identity map and the repository cache.
+
+    Args:
+        row(Row[Any]): row of selected columns.
+        row_type(RowType): `row` to keep the `Row`, `mapping` for a read-only
+            mapping of column names to values or a Pydantic schema validated
+            from the row attributes.
+
+    Returns:
+        Any: converted row.
+    """
+
+    if row_type == "row":
+        return row
+    elif row_type == "mapping":
+        return row._mapping
+    return row_type.model_validate(row, from_attributes=True)
+
+
+# MARK: Chunks
+async def _iter_chunks(
+    data: Iterable[Any] | AsyncIterable[Any], chunk_size: int
+) -> AsyncGenerator[list[Any], None]:
+    """
+    Split `data` into lists of at most `chunk_size` items without loading all of it.
+
+    Args:
+        data(Iterable[Any] | AsyncIterable[Any]): items to split.
+        chunk_size(int): maximum number of items in a chunk.
+
+    Yields:
+        list[Any]: chunks of items.
+    """
+
+    chunk: list[Any] = []
+    if isinstance(data, AsyncIterable):
+        async for item in data:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for item in data:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
@@ -20,9 +200,161 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     Attributes:
         model (Type[ModelType]): SQLAlchemy model.
+        cache (RepositoryCache | None): opt-in read-through cache of `get_one_or_none`
+            and `get_exactly_one` lookups by equality on columns,
+            invalidated in all workers by `update`, `update_bulk`, `upsert`,
+            `upsert_bulk`, `delete` and by flushes of changed model instances.
+        write_buffer (WriteBuffer | None): opt-in buffer of `add_buffered` rows
+            merged into multi-row inserts.
+        version_column (str | None): column changed by every update of a record,
+            e.g. a version counter or `updated_at`, used by `get_version`.
+            Whole rows are compared if it's `None`.
     """
 
     model: Type[ModelType]
+    cache: ClassVar[RepositoryCache | None] = None
+    write_buffer: ClassVar[WriteBuffer | None] = None
+    version_column: ClassVar[str | None] = None
+    _statements: ClassVar[dict[str, Any]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._statements = {}
+        if cls.cache is not None and hasattr(cls, "model"):
+            register_cache(cls.model.__tablename__, cls.cache)
+        if cls.write_buffer is not None and hasattr(cls, "model"):
+            cls.write_buffer.bind(cls.model)
+
+    # MARK: Statements
+    @classmethod
+    def _statement(cls, name: str, build: Callable[[], StatementType]) -> StatementType:
+        """
+        Return the statement template `name` of the model, built by `build` on the first call.
+
+        Templates take values as bound parameters at execution, so the construct and
+        its SQL compilation cache key are made once per model instead of on every call.
+        """
+
+        statement = cls._statements.get(name)
+        if statement is None:
+            statement = cls._statements[name] = build()
+        return statement
+
+    # MARK: Cache
+    @classmethod
+    def _cache_key(
+        cls, where: tuple[_ColumnExpressionArgument[bool], ...]
+    ) -> Hashable | None:
+        """
+        Return a normalized cache key of `where` clauses or `None` if they are not cacheable.
+
+        Only `column == value` clauses on the model columns, optionally joined with `AND`,
+        are cacheable. The key doesn't depend on the order of clauses.
+        """
+
+        if cls.cache is None:
+            return None
+
+        clauses = list(where)
+        items: list[tuple[str, Any]] = []
+        while clauses:
+            clause = clauses.pop()
+            if (
+                isinstance(clause, BooleanClauseList)
+                and clause.operator is operators.and_
+            ):
+                clauses.extend(clause.clauses)
+            elif (
+                isinstance(clause, BinaryExpression)
+                and clause.operator is operators.eq
+                and isinstance(clause.left, Column)
+                and clause.left.table is cls.model.__table__
+                and isinstance(clause.right, BindParameter)
+                and isinstance(clause.right.effective_value, Hashable)
+            ):
+                items.append((clause.left.key, clause.right.effective_value))
+            else:
+                return None
+
+        if not items:
+            return None
+        return tuple(sorted(items, key=lambda item: item[0]))
+
+    @classmethod
+    async def _get_cached(
+        cls, key: Hashable, session: AsyncSession
+    ) -> ModelType | None:
+        """Return a model instance cached under `key` merged into `session` or `None`."""
+
+        if cls.cache is None or (data := cls.cache.get(key)) is None:
+            return None
+
+        instance = cls.model(**data)
+        make_transient_to_detached(instance)
+        return await session.merge(instance, load=False)
+
+    @classmethod
+    def _set_cached(cls, key: Hashable, instance: ModelType) -> None:
+        """Cache column values of `instance` under `key`."""
+
+        if cls.cache is None:
+            return
+
+        state = inspect(instance)
+        data = {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+        cls.cache.set(key, instance.id, data)  # type: ignore
+
+    @classmethod
+    async def invalidate_cache(
+        cls, session: AsyncSession, ids: list[Any] | None = None
+    ) -> None:
+        """
+        Invalidate cached records with primary keys `ids` or all cached records if `ids` is `None`.
+
+        Records are invalidated in the current worker at once
+        and in the other workers when the session transaction is committed.
+        Call it after changing the records bypassing `BaseRepository` methods.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            ids(list[Any] | None): primary keys of changed records.
+        """
+
+        if cls.cache is None:
+            return
+
+        cls.cache.invalidate(ids)
+        await notify_invalidation(session, cls.model.__tablename__, ids)
+
+    @classmethod
+    async def _execute_invalidating(
+        cls,
+        session: AsyncSession,
+        stmt: Update | Delete,
+        return_type: Literal["model", "id_uuid", "id_int"] | None,
+    ) -> Any:
+        """
+        Execute `UPDATE` or `DELETE` statement and invalidate cached records it changed.
+
+        Returns the first changed record like `update` and `delete` do.
+        """
+
+        if return_type == "model":
+            result = await session.execute(stmt.returning(cls.model))
+            returned = result.scalars().all()
+            ids = [instance.id for instance in returned]  # type: ignore
+        else:
+            result = await session.execute(stmt.returning(cls.model.id))  # type: ignore
+            returned = ids = list(result.scalars().all())
+
+        await cls.invalidate_cache(session, ids)
+        if return_type is None or not returned:
+            return None
+        return returned[0]
 
     # MARK: Create
     @overload
@@ -59,6 +391,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> None: ...
 
     @classmethod
+    @track_repository_call
     async def add(
         cls,
         session: AsyncSession,
@@ -86,19 +419,41 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         else:
             create_data = create_data.model_dump(exclude_unset=True)
 
-        stmt = insert(cls.model).values(**create_data)
-
         if return_type is None:
-            await session.execute(stmt)
+            await session.execute(cls._insert_statement(None), create_data)
             return None
-        elif return_type in ("id_int", "id_uuid"):
-            stmt = stmt.returning(cls.model.id)  # type: ignore
-        elif return_type == "model":
-            stmt = stmt.returning(cls.model)
 
-        result = await session.execute(stmt)
+        result = await session.execute(
+            cls._insert_statement("model" if return_type == "model" else "id"),
+            create_data,
+        )
         return result.scalar_one()
 
+    @classmethod
+    def add_buffered(
+        cls, create_data: CreateSchemaType | dict[str, Any]
+    ) -> asyncio.Future[Any]:
+        """
+        Buffer a record for insert with other records through `write_buffer`.
+
+        The record is inserted and committed in a session of the buffer,
+        not in the caller's session. If `create_data` is a Pydantic model,
+        fields not explicitly set are excluded.
+
+        Args:
+            create_data(CreateSchemaType|dict[str, Any]): Pydantic schema or dictionary of data to create.
+
+        Returns:
+            asyncio.Future[Any]: `id` of the created record or the error of the insert.
+        """
+
+        if cls.write_buffer is None:
+            raise RuntimeError(f"{cls.__name__} has no write_buffer")
+
+        if not isinstance(create_data, dict):
+            create_data = create_data.model_dump(exclude_unset=True)
+        return cls.write_buffer.add(create_data)
+
     @overload
     @classmethod
     async def add_bulk(
@@ -122,6 +477,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> None: ...
 
     @classmethod
+    @track_repository_call
     async def add_bulk(
         cls,
         session: AsyncSession,
@@ -142,39 +498,493 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 or `None` depends on `return_type`.
         """
 
-        stmt = insert(cls.model)
+        if return_type is None:
+            await session.execute(cls._insert_statement(None), create_data)
+            return None
+
+        result = await session.execute(cls._insert_statement(return_type), create_data)
+        return list(result.scalars())
+
+    @classmethod
+    def _insert_statement(cls, returning: Literal["model", "id"] | None) -> Insert:
+        """Return the `INSERT` template of the model returning `returning`."""
+
+        if returning is None:
+            return cls._statement("insert", lambda: insert(cls.model))
+        elif returning == "id":
+            return cls._statement(
+                "insert_returning_id",
+                lambda: insert(cls.model).returning(cls.model.id),  # type: ignore
+            )
+        return cls._statement(
+            "insert_returning_model", lambda: insert(cls.model).returning(cls.model)
+        )
+
+    @overload
+    @classmethod
+    async def add_bulk_copy(
+        cls,
+        session: AsyncSession,
+        create_data: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        columns: Sequence[str] | None = None,
+        chunk_size: int = api_constants.DEFAULT_COPY_CHUNK_SIZE,
+        return_type: None = None,
+    ) -> None: ...
+    @overload
+    @classmethod
+    async def add_bulk_copy(
+        cls,
+        session: AsyncSession,
+        create_data: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        columns: Sequence[str] | None = None,
+        chunk_size: int = api_constants.DEFAULT_COPY_CHUNK_SIZE,
+        *,
+        return_type: Literal["id"],
+    ) -> list[Any]: ...
+
+    @classmethod
+    @track_repository_call
+    async def add_bulk_copy(
+        cls,
+        session: AsyncSession,
+        create_data: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        columns: Sequence[str] | None = None,
+        chunk_size: int = api_constants.DEFAULT_COPY_CHUNK_SIZE,
+        return_type: Literal["id"] | None = None,
+    ) -> list[Any] | None:
+        """
+        Add multiple records through PostgreSQL `COPY` on the session connection.
+
+        A fast path of `add_bulk` for large imports: `create_data` is consumed lazily
+        and sent with asyncpg `copy_records_to_table` in chunks of `chunk_size` rows,
+        so it may be a generator of any length.
+
+        With `return_type="id"` every chunk is copied into a temporary staging table
+        and moved with `INSERT ... SELECT ... RETURNING id`.
+        The order of returned ids isn't guaranteed to match the order of `create_data`.
+
+        Note:
+        * Every row must contain all `columns`, missing keys are copied as `NULL`.
+        * Python-side column defaults and ORM events are not applied,
+        server-side defaults are.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            create_data(Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]]): data to create.
+            columns(Sequence[str] | None): model attributes to copy,
+                keys of the first row by default.
+            chunk_size(int): number of rows sent by a single `COPY`.
+            return_type(Literal["id"] | None): function return type, `None` by default.
+
+        Returns:
+            list[Any]|None: list of created model ids or `None` depends on `return_type`.
+        """
+
+        mapper = inspect(cls.model)
+        table: Table = cls.model.__table__  # type: ignore[assignment]
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+        preparer = connection.dialect.identifier_preparer
+
+        target_table = preparer.format_table(table)
+        staging_name = f"_copy_{table.name}"
+        staging_table = preparer.quote(staging_name)
+        copy_table, copy_schema = table.name, table.schema
+
+        ids: list[Any] = []
+        keys: list[str] = list(columns or ())
+        quoted_columns = ""
+        async for chunk in _iter_chunks(create_data, chunk_size):
+            if not quoted_columns:
+                keys = keys or list(chunk[0])
+                quoted_columns = ", ".join(
+                    preparer.quote(mapper.columns[key].name) for key in keys
+                )
+                if return_type == "id":
+                    await session.execute(
+                        text(
+                            f"CREATE TEMPORARY TABLE {staging_table} ON COMMIT DROP "
+                            f"AS SELECT {quoted_columns} FROM {target_table} WITH NO DATA"
+                        )
+                    )
+                    copy_table, copy_schema = staging_name, None
+
+            await driver_connection.copy_records_to_table(
+                copy_table,
+                records=[tuple(row.get(key) for key in keys) for row in chunk],
+                columns=[mapper.columns[key].name for key in keys],
+                schema_name=copy_schema,
+            )
+
+            if return_type == "id":
+                result = await session.execute(
+                    text(
+                        f"INSERT INTO {target_table} ({quoted_columns}) "
+                        f"SELECT {quoted_columns} FROM {staging_table} "
+                        f"RETURNING {preparer.quote(mapper.columns['id'].name)}"
+                    )
+                )
+                ids.extend(result.scalars().all())
+                await session.execute(text(f"TRUNCATE {staging_table}"))
 
         if return_type is None:
-            await session.execute(stmt, create_data)
             return None
-        elif return_type == "id":
+        if quoted_columns:
+            await session.execute(text(f"DROP TABLE {staging_table}"))
+        return ids
+
+    # MARK: Upsert
+    @classmethod
+    def _upsert_stmt(
+        cls,
+        create_data: list[dict[str, Any]],
+        conflict_target: Sequence[str],
+        conflict_constraint: str | None,
+        on_conflict: Literal["update", "nothing"],
+        update_policy: dict[str, UpsertPolicy],
+    ) -> Insert:
+        """
+        Build `INSERT ... ON CONFLICT` statement for `upsert` and `upsert_bulk`.
+
+        Columns of `create_data` not in `conflict_target` are overwritten with the new values
+        unless `update_policy` says otherwise. If there is nothing to update,
+        conflicting rows are left as is.
+        """
+
+        stmt = postgres_insert(cls.model).values(create_data)
+        target: dict[str, Any] = (
+            {"constraint": conflict_constraint}
+            if conflict_constraint is not None
+            else {"index_elements": list(conflict_target)}
+        )
+
+        set_: dict[str, Any] = {}
+        if on_conflict == "update":
+            for key in create_data[0]:
+                policy = update_policy.get(key, "overwrite")
+                if key in conflict_target or policy == "keep":
+                    continue
+                elif policy == "overwrite":
+                    set_[key] = stmt.excluded[key]
+                elif policy == "coalesce":
+                    set_[key] = func.coalesce(
+                        stmt.excluded[key], getattr(cls.model, key)
+                    )
+                else:
+                    set_[key] = policy
+
+        if not set_:
+            return stmt.on_conflict_do_nothing(**target)
+        return stmt.on_conflict_do_update(**target, set_=set_)
+
+    @overload
+    @classmethod
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        create_data: CreateSchemaType | dict[str, Any],
+        return_type: Literal["model"] = "model",
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> ModelType | None: ...
+    @overload
+    @classmethod
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        create_data: CreateSchemaType | dict[str, Any],
+        return_type: Literal["id_int"],
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> int | None: ...
+    @overload
+    @classmethod
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        create_data: CreateSchemaType | dict[str, Any],
+        return_type: Literal["id_uuid"],
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> uuid.UUID | None: ...
+    @overload
+    @classmethod
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        create_data: CreateSchemaType | dict[str, Any],
+        return_type: None,
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> None: ...
+
+    @classmethod
+    @track_repository_call
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        create_data: CreateSchemaType | dict[str, Any],
+        return_type: Literal["model", "id_int", "id_uuid"] | None = "model",
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> ModelType | uuid.UUID | int | None:
+        """
+        Insert a record or update the existing one on conflict in a single statement.
+
+        If `create_data` is a Pydantic model, fields not explicitly set are excluded.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            create_data(CreateSchemaType|dict[str, Any]): Pydantic schema or dictionary of data to upsert.
+            return_type(Literal["model", "id_int", "id_uuid"] | None): function return type, `model` by default.
+            conflict_target(Sequence[str]): columns of a unique index to detect conflicts on.
+            conflict_constraint(str | None): name of a unique constraint to detect conflicts on,
+                takes precedence over `conflict_target`.
+            on_conflict(Literal["update", "nothing"]): update the existing record or leave it as is.
+            update_policy(dict[str, UpsertPolicy] | None): how to update a column on conflict:
+                `overwrite` with the new value (default), `keep` the existing value,
+                `coalesce` to overwrite only with a not `NULL` value
+                or a SQL expression, e.g. `Model.counter + 1`.
+
+        Returns:
+            ModelType|uuid.UUID|int|None:
+                inserted or updated model instance, its `id`
+                or `None` depends on `return_type` or if the record was left as is.
+        """
+
+        if isinstance(create_data, dict):
+            create_data = create_data
+        else:
+            create_data = create_data.model_dump(exclude_unset=True)
+
+        stmt = cls._upsert_stmt(
+            [create_data],
+            conflict_target=conflict_target,
+            conflict_constraint=conflict_constraint,
+            on_conflict=on_conflict,
+            update_policy=update_policy or {},
+        )
+        await cls.invalidate_cache(
+            session, [create_data["id"]] if "id" in create_data else None
+        )
+
+        if return_type is None:
+            await session.execute(stmt)
+            return None
+        elif return_type in ("id_int", "id_uuid"):
             stmt = stmt.returning(cls.model.id)  # type: ignore
         elif return_type == "model":
-            stmt = stmt.returning(cls.model)
+            stmt = stmt.returning(cls.model).execution_options(populate_existing=True)
+
+        return await session.scalar(stmt)
+
+    @overload
+    @classmethod
+    async def upsert_bulk(
+        cls,
+        session: AsyncSession,
+        create_data: list[dict[str, Any]],
+        return_type: Literal["model"] = "model",
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> list[ModelType]: ...
+    @overload
+    @classmethod
+    async def upsert_bulk(
+        cls,
+        session: AsyncSession,
+        create_data: list[dict[str, Any]],
+        return_type: Literal["id_int"],
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> list[int]: ...
+    @overload
+    @classmethod
+    async def upsert_bulk(
+        cls,
+        session: AsyncSession,
+        create_data: list[dict[str, Any]],
+        return_type: Literal["id_uuid"],
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> list[uuid.UUID]: ...
+    @overload
+    @classmethod
+    async def upsert_bulk(
+        cls,
+        session: AsyncSession,
+        create_data: list[dict[str, Any]],
+        return_type: None,
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> None: ...
+
+    @classmethod
+    @track_repository_call
+    async def upsert_bulk(
+        cls,
+        session: AsyncSession,
+        create_data: list[dict[str, Any]],
+        return_type: Literal["model", "id_int", "id_uuid"] | None = "model",
+        *,
+        conflict_target: Sequence[str] = ("id",),
+        conflict_constraint: str | None = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        update_policy: dict[str, UpsertPolicy] | None = None,
+    ) -> list[ModelType] | list[uuid.UUID] | list[int] | None:
+        """
+        Insert multiple records or update the existing ones on conflict.
+
+        Records are sent as multi-row `INSERT ... ON CONFLICT` statements, one per chunk,
+        chunks are sized to stay under the PostgreSQL bind parameters limit.
+
+        Note:
+        * All records must have the same keys.
+        * A chunk can't contain two records conflicting on the same row.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            create_data(list[dict[str, Any]]): data to upsert.
+            return_type(Literal["model", "id_int", "id_uuid"] | None): function return type, `model` by default.
+            conflict_target(Sequence[str]): columns of a unique index to detect conflicts on.
+            conflict_constraint(str | None): name of a unique constraint to detect conflicts on,
+                takes precedence over `conflict_target`.
+            on_conflict(Literal["update", "nothing"]): update the existing records or leave them as is.
+            update_policy(dict[str, UpsertPolicy] | None): how to update a column on conflict,
+                see `upsert`.
+
+        Returns:
+            list[ModelType]|list[uuid.UUID]|list[int]|None:
+                list of inserted or updated model instances, list of their ids
+                or `None` depends on `return_type`.
+                Records left as is are not returned.
+        """
 
-        result = await session.execute(stmt, create_data)
-        return result.scalars().all()
+        if not create_data:
+            return None if return_type is None else []
+
+        await cls.invalidate_cache(
+            session,
+            [row["id"] for row in create_data] if "id" in create_data[0] else None,
+        )
+
+        chunk_size = max(
+            1, api_constants.POSTGRES_MAX_BIND_PARAMS // len(create_data[0])
+        )
+        returned: list[Any] = []
+        for start in range(0, len(create_data), chunk_size):
+            stmt = cls._upsert_stmt(
+                create_data[start : start + chunk_size],
+                conflict_target=conflict_target,
+                conflict_constraint=conflict_constraint,
+                on_conflict=on_conflict,
+                update_policy=update_policy or {},
+            )
+
+            if return_type is None:
+                await session.execute(stmt)
+                continue
+            elif return_type in ("id_int", "id_uuid"):
+                stmt = stmt.returning(cls.model.id)  # type: ignore
+            elif return_type == "model":
+                stmt = stmt.returning(cls.model).execution_options(
+                    populate_existing=True
+                )
+
+            result = await session.execute(stmt)
+            returned.extend(result.scalars().all())
+
+        return None if return_type is None else returned
 
     # MARK: Read
+    @overload
     @classmethod
     async def get_one_or_none(
-        cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
-    ) -> ModelType | None:
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: None = None,
+        row_type: RowType = "row",
+    ) -> ModelType | None: ...
+    @overload
+    @classmethod
+    async def get_one_or_none(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]],
+        row_type: RowType = "row",
+    ) -> Any | None: ...
+
+    @classmethod
+    @track_repository_call
+    async def get_one_or_none(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]] | None = None,
+        row_type: RowType = "row",
+    ) -> ModelType | Any | None:
         """
         Return a single record matching `where` clauses or `None` if no record was found.
 
         Args:
             where: where clauses.
             session(AsyncSession): Asynchronous SQLAlchemy session.
+            columns(Sequence[_ColumnsClauseArgument[Any]] | None): columns to select
+                instead of the model, see `_convert_row` for `row_type`.
+            row_type(RowType): type of the projected record, `row` by default.
 
         Returns:
-            ModelType|None: The model instance found, or `None` if no record was found.
+            ModelType|Any|None: The model instance or the projected record found,
+                or `None` if no record was found.
         """
 
-        stmt = select(cls.model).where(*where)
-        return await session.scalar(stmt)
+        if columns is not None:
+            stmt = select(*columns).where(*where).execution_options(**_REPLICA_OPTIONS)
+            row = (await session.execute(stmt)).one_or_none()
+            return None if row is None else _convert_row(row, row_type)
+
+        key = cls._cache_key(where)
+        if key is not None and (cached := await cls._get_cached(key, session)):
+            return cached
+
+        stmt = select(cls.model).where(*where).execution_options(**_REPLICA_OPTIONS)
+        instance = await session.scalar(stmt)
+        if key is not None and instance is not None:
+            cls._set_cached(key, instance)
+        return instance
 
     @classmethod
+    @track_repository_call
     async def get_one_or_none_id(
         cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
     ) -> uuid.UUID | None:
@@ -189,27 +999,364 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             uuid.UUID|None: The model instance id found, or `None` if no record was found.
         """
 
-        stmt = select(cls.model.id).where(*where)  # type: ignore
+        stmt = (
+            select(cls.model.id)  # type: ignore
+            .where(*where)
+            .execution_options(**_REPLICA_OPTIONS)
+        )
         return await session.scalar(stmt)
 
+    @overload
     @classmethod
     async def get_exactly_one(
-        cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
-    ) -> ModelType:
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: None = None,
+        row_type: RowType = "row",
+    ) -> ModelType: ...
+    @overload
+    @classmethod
+    async def get_exactly_one(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]],
+        row_type: RowType = "row",
+    ) -> Any: ...
+
+    @classmethod
+    @track_repository_call
+    async def get_exactly_one(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]] | None = None,
+        row_type: RowType = "row",
+    ) -> ModelType | Any:
         """
         Return exactly one result matching `where` clauses or raise an exception.
 
         Args:
             where: where clauses.
             session(AsyncSession): Asynchronous SQLAlchemy session.
+            columns(Sequence[_ColumnsClauseArgument[Any]] | None): columns to select
+                instead of the model, see `_convert_row` for `row_type`.
+            row_type(RowType): type of the projected record, `row` by default.
 
         Returns:
-            ModelType: The model instance found.
+            ModelType|Any: The model instance or the projected record found.
         """
 
-        stmt = select(cls.model).where(*where)
+        if columns is not None:
+            stmt = select(*columns).where(*where).execution_options(**_REPLICA_OPTIONS)
+            row = (await session.execute(stmt)).one()
+            return _convert_row(row, row_type)
+
+        key = cls._cache_key(where)
+        if key is not None and (cached := await cls._get_cached(key, session)):
+            return cached
+
+        stmt = select(cls.model).where(*where).execution_options(**_REPLICA_OPTIONS)
         result = await session.execute(stmt)
-        return result.scalar_one()
+        instance = result.scalar_one()
+        if key is not None:
+            cls._set_cached(key, instance)
+        return instance
+
+    @overload
+    @classmethod
+    async def get_many_by_ids(
+        cls,
+        ids: Sequence[Any],
+        session: AsyncSession,
+        columns: None = None,
+        row_type: RowType = "row",
+    ) -> list[ModelType]: ...
+    @overload
+    @classmethod
+    async def get_many_by_ids(
+        cls,
+        ids: Sequence[Any],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]],
+        row_type: RowType = "row",
+    ) -> list[Any]: ...
+
+    @classmethod
+    @track_repository_call
+    async def get_many_by_ids(
+        cls,
+        ids: Sequence[Any],
+        session: AsyncSession,
+        columns: Sequence[_ColumnsClauseArgument[Any]] | None = None,
+        row_type: RowType = "row",
+    ) -> list[ModelType] | list[Any]:
+        """
+        Return records with primary keys `ids` in a single query.
+
+        `ids` are bound as a single array parameter of `id = ANY(:ids)`,
+        so the statement is the same for any number of ids.
+
+        Args:
+            ids(Sequence[Any]): primary keys, must be of the primary key column type.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            columns(Sequence[_ColumnsClauseArgument[Any]] | None): columns to select
+                instead of the model, must include the primary key,
+                see `_convert_row` for `row_type`.
+            row_type(RowType): type of the projected records, `row` by default.
+
+        Returns:
+            list[ModelType]|list[Any]: model instances or projected records
+                in the order of `ids`, missing records are skipped.
+        """
+
+        if not ids:
+            return []
+
+        id_column: InstrumentedAttribute[Any] = cls.model.id  # type: ignore
+        if columns is not None:
+            where = id_column == any_(
+                bindparam("ids", list(ids), ARRAY(id_column.type))
+            )
+            stmt = select(*columns).where(where).execution_options(**_REPLICA_OPTIONS)
+            rows_by_id = {row.id: row for row in (await session.execute(stmt)).all()}
+            return [
+                _convert_row(rows_by_id[id], row_type) for id in ids if id in rows_by_id
+            ]
+
+        stmt = cls._statement(
+            "get_many_by_ids",
+            lambda: (
+                select(cls.model)
+                .where(id_column == any_(bindparam("ids", type_=ARRAY(id_column.type))))
+                .execution_options(**_REPLICA_OPTIONS)
+            ),
+        )
+        result = await session.scalars(stmt, {"ids": list(ids)})
+        instances_by_id = {instance.id: instance for instance in result.all()}
+        return [instances_by_id[id] for id in ids if id in instances_by_id]
+
+    @classmethod
+    def get_loader(cls, session: AsyncSession) -> BatchLoader[ModelType]:
+        """
+        Return the `BatchLoader` of the model bound to `session`.
+
+        Lookups by `BatchLoader.load` made in the same event loop tick
+        are merged into one `get_many_by_ids` query. The loader lives as long as
+        the session, so it is request-scoped with `get_session`.
+        Loaders of different models sharing the session run their queries one by one.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+
+        Returns:
+            BatchLoader[ModelType]: loader of the model records.
+        """
+
+        loaders = session.info.setdefault(api_constants.LOADERS_SESSION_INFO, {})
+        if cls.model not in loaders:
+            lock = session.info.setdefault(
+                api_constants.LOADERS_LOCK_SESSION_INFO, asyncio.Lock()
+            )
+            loaders[cls.model] = BatchLoader(
+                load_many=lambda ids: cls.get_many_by_ids(ids, session=session),
+                lock=lock,
+            )
+        return loaders[cls.model]
+
+    @classmethod
+    @track_repository_call
+    async def get_list_with_count(
+        cls,
+        session: AsyncSession,
+        stmt: Select[Any],
+        offset: int | None = api_constants.DEFAULT_QUERY_OFFSET,
+        limit: int | None = api_constants.DEFAULT_QUERY_LIMIT,
+    ) -> tuple[Sequence[Any], int]:
+        """
+        Return a page of `stmt` results and the total number of its results in one query.
+
+        The total is selected with `count(*) OVER ()` along with the page rows.
+        A separate count query is executed only if the page is empty and `offset` is set,
+        e.g. when the page is beyond the last one.
+
+        Args:
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            stmt(Select[Any]): filtered and ordered statement without offset and limit.
+            offset(int | None): query offset.
+            limit(int | None): query limit.
+
+        Returns:
+            tuple[Sequence[Any], int]:
+                model instances, or rows if `stmt` selects several entities or columns,
+                and the total number of results.
+        """
+
+        page_stmt = (
+            stmt.add_columns(func.count().over())
+            .offset(offset)
+            .limit(limit)
+            .execution_options(**_REPLICA_OPTIONS)
+        )
+        result = await session.execute(page_stmt)
+        rows = result.all()
+
+        if rows:
+            total = rows[0][-1]
+        elif offset:
+            count_stmt = select(func.count()).select_from(
+                stmt.order_by(None).subquery()
+            )
+            total = await cls.count_from_stmt(session, count_stmt)
+        else:
+            total = 0
+
+        if len(stmt.column_descriptions) == 1:
+            return [row[0] for row in rows], total
+        return [row[:-1] for row in rows], total
+
+    @classmethod
+    @track_repository_call
+    async def get_cursor_page(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        order_by: InstrumentedAttribute[Any] | None = None,
+        cursor: str | None = None,
+        limit: int = api_constants.DEFAULT_QUERY_LIMIT,
+        asc: bool = True,
+        columns: Sequence[_ColumnsClauseArgument[Any]] | None = None,
+        row_type: RowType = "row",
+    ) -> tuple[Sequence[ModelType] | Sequence[Any], str | None, str | None]:
+        """
+        Return a page of records matching `where` clauses using keyset (cursor) pagination.
+
+        Rows are sought by `(order_by, id)` instead of being skipped with `OFFSET`,
+        so every page costs the same regardless of its depth
+        if there is an index on `(order_by, id)`.
+        `order_by` must be a `NOT NULL` column.
+
+        Args:
+            where: where clauses.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            order_by(InstrumentedAttribute[Any] | None): sort key, primary key by default.
+            cursor(str | None): `next_cursor` or `prev_cursor` of the previous page,
+                the first page is returned if `None`.
+            limit(int): maximum number of records in the page.
+            asc(bool): sorting order on `order_by`.
+            columns(Sequence[_ColumnsClauseArgument[Any]] | None): columns to select
+                instead of the model, must include the primary key and `order_by`,
+                see `_convert_row` for `row_type`.
+            row_type(RowType): type of the projected records, `row` by default.
+
+        Returns:
+            tuple[Sequence[ModelType] | Sequence[Any], str | None, str | None]:
+                model instances or projected records of the page,
+                `next_cursor` and `prev_cursor`.
+                A cursor is `None` if there is no page in its direction.
+        """
+
+        id_column: InstrumentedAttribute[Any] = cls.model.id  # type: ignore
+        sort_column = id_column if order_by is None else order_by
+
+        forward = True
+        stmt = (
+            (select(cls.model) if columns is None else select(*columns))
+            .where(*where)
+            .execution_options(**_REPLICA_OPTIONS)
+        )
+        if cursor is not None:
+            forward, sort_value, id_value = _decode_cursor(
+                cursor, sort_column=sort_column, id_column=id_column
+            )
+            seek_key = tuple_(sort_column, id_column)
+            seek_value = tuple_(sort_value, id_value)
+            if forward == asc:
+                stmt = stmt.where(seek_key > seek_value)
+            else:
+                stmt = stmt.where(seek_key < seek_value)
+
+        if forward == asc:
+            stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+        else:
+            stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+
+        result = await session.execute(stmt.limit(limit + 1))
+        items: list[Any] = list(result.scalars() if columns is None else result.all())
+        has_more = len(items) > limit
+        items = items[:limit]
+        if not forward:
+            items.reverse()
+        if not items:
+            return items, None, None
+
+        if forward:
+            has_next, has_prev = has_more, cursor is not None
+        else:
+            has_next, has_prev = True, has_more
+
+        next_cursor = (
+            _encode_cursor(items[-1], sort_column=sort_column, forward=True)
+            if has_next
+            else None
+        )
+        prev_cursor = (
+            _encode_cursor(items[0], sort_column=sort_column, forward=False)
+            if has_prev
+            else None
+        )
+        if columns is not None:
+            items = [_convert_row(row, row_type) for row in items]
+        return items, next_cursor, prev_cursor
+
+    # MARK: Stream
+    @classmethod
+    async def stream(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        order_by: Sequence[_ColumnExpressionArgument[Any]] = (),
+        yield_per: int = api_constants.DEFAULT_STREAM_YIELD_PER,
+        columns: Sequence[_ColumnsClauseArgument[Any]] | None = None,
+        row_type: RowType = "row",
+    ) -> AsyncGenerator[ModelType | Any, None]:
+        """
+        Stream records matching `where` clauses through a server-side cursor.
+
+        Only `yield_per` rows are fetched into memory at a time, so memory usage
+        doesn't depend on the number of records. The session must stay open
+        until the generator is exhausted or closed.
+
+        Args:
+            where: where clauses.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            order_by(Sequence[_ColumnExpressionArgument[Any]]): order by clauses.
+            yield_per(int): number of rows fetched from the cursor at a time.
+            columns(Sequence[_ColumnsClauseArgument[Any]] | None): columns to select
+                instead of the model, see `_convert_row` for `row_type`.
+            row_type(RowType): type of the projected records, `row` by default.
+
+        Yields:
+            ModelType|Any: model instances or projected records one by one.
+        """
+
+        stmt = (
+            (select(cls.model) if columns is None else select(*columns))
+            .where(*where)
+            .order_by(*order_by)
+            .execution_options(yield_per=yield_per, **_REPLICA_OPTIONS)
+        )
+        result = await session.stream(stmt)
+        try:
+            if columns is None:
+                async for instance in result.scalars():
+                    yield instance
+            else:
+                async for row in result:
+                    yield _convert_row(row, row_type)
+        finally:
+            await result.close()
 
     # MARK: Update
     @overload
@@ -250,6 +1397,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> None: ...
 
     @classmethod
+    @track_repository_call
     async def update(
         cls,
         *where: _ColumnExpressionArgument[bool],
@@ -281,7 +1429,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         stmt = update(cls.model).where(*where).values(**update_data)
 
-        if return_type is None:
+        if cls.cache is not None:
+            return await cls._execute_invalidating(session, stmt, return_type)
+        elif return_type is None:
             await session.execute(stmt)
             return None
         elif return_type in ("id_uuid", "id_int"):
@@ -291,20 +1441,161 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         return await session.scalar(stmt)
 
+    @overload
     @classmethod
     async def update_bulk(
-        cls, session: AsyncSession, update_data: list[dict[str, Any]]
-    ) -> None:
+        cls,
+        session: AsyncSession,
+        update_data: list[dict[str, Any]],
+        return_type: None = None,
+        *,
+        mode: Literal["executemany", "values"] = "executemany",
+        chunk_size: int | None = None,
+        version_column: str | None = None,
+    ) -> None: ...
+    @overload
+    @classmethod
+    async def update_bulk(
+        cls,
+        session: AsyncSession,
+        update_data: list[dict[str, Any]],
+        return_type: Literal["model"],
+        *,
+        mode: Literal["values"],
+        chunk_size: int | None = None,
+        version_column: str | None = None,
+    ) -> list[ModelType]: ...
+    @overload
+    @classmethod
+    async def update_bulk(
+        cls,
+        session: AsyncSession,
+        update_data: list[dict[str, Any]],
+        return_type: Literal["id"],
+        *,
+        mode: Literal["values"],
+        chunk_size: int | None = None,
+        version_column: str | None = None,
+    ) -> list[Any]: ...
+
+    @classmethod
+    @track_repository_call
+    async def update_bulk(
+        cls,
+        session: AsyncSession,
+        update_data: list[dict[str, Any]],
+        return_type: Literal["model", "id"] | None = None,
+        *,
+        mode: Literal["executemany", "values"] = "executemany",
+        chunk_size: int | None = None,
+        version_column: str | None = None,
+    ) -> list[ModelType] | list[Any] | None:
         """
         Update multiple records in the database at once with different data.
 
+        In `executemany` mode SQLAlchemy sends an `UPDATE` per record.
+        In `values` mode records are sent as `UPDATE ... FROM (VALUES ...)` statements,
+        one per chunk of records with the same keys, chunks are sized to stay
+        under the PostgreSQL bind parameters limit.
+
+        Note:
+        * Returned records are not in the order of `update_data`.
+        * With `version_column` each record must have the expected current version
+            under that key, the version of updated records is incremented.
+            If any record has another version or doesn't exist `StaleDataError` is raised
+            after other records are updated, the transaction should be rolled back.
+
         Args:
-            session(AsyncSession): асинхронная сессия SQLAlchemy;
-            data(list[dict[str, Any]]):
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            update_data(list[dict[str, Any]]):
                 a list containing dictionaries of each record's primary key and the data to update it with.
+            return_type(Literal["model", "id"] | None): function return type, `None` by default,
+                only in `values` mode.
+            mode(Literal["executemany", "values"]): how to send the records, `executemany` by default.
+            chunk_size(int | None): maximum number of records per statement in `values` mode.
+            version_column(str | None): integer column for optimistic concurrency checks
+                in `values` mode.
+
+        Returns:
+            list[ModelType]|list[Any]|None:
+                list of updated model instances, list of their ids
+                or `None` depends on `return_type`.
         """
 
-        await session.execute(update(cls.model), update_data)
+        if mode == "executemany":
+            if return_type is not None or version_column is not None:
+                raise ValueError(
+                    "return_type and version_column require update_bulk values mode"
+                )
+            await session.execute(
+                cls._statement("update", lambda: update(cls.model)), update_data
+            )
+            await cls.invalidate_cache(session, [row["id"] for row in update_data])
+            return None
+
+        await cls.invalidate_cache(session, [row["id"] for row in update_data])
+
+        rows_by_keys: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in update_data:
+            rows_by_keys.setdefault(tuple(row), []).append(row)
+
+        returned: list[Any] = []
+        updated = 0
+        for keys, rows in rows_by_keys.items():
+            max_chunk_size = max(1, api_constants.POSTGRES_MAX_BIND_PARAMS // len(keys))
+            size = min(chunk_size or max_chunk_size, max_chunk_size)
+            for start in range(0, len(rows), size):
+                stmt = cls._update_from_values_stmt(
+                    keys, rows[start : start + size], version_column
+                )
+
+                if return_type is None:
+                    result = await session.execute(stmt)
+                    updated += result.rowcount
+                    continue
+                elif return_type == "id":
+                    stmt = stmt.returning(cls.model.id)  # type: ignore
+                elif return_type == "model":
+                    stmt = stmt.returning(cls.model).execution_options(
+                        populate_existing=True
+                    )
+
+                result = await session.execute(stmt)
+                chunk_returned = result.scalars().all()
+                updated += len(chunk_returned)
+                returned.extend(chunk_returned)
+
+        if version_column is not None and updated < len(update_data):
+            raise StaleDataError(
+                f"{len(update_data) - updated} of {len(update_data)} records "
+                f"of {cls.model.__tablename__} have another {version_column} "
+                "or don't exist"
+            )
+
+        return None if return_type is None else returned
+
+    @classmethod
+    def _update_from_values_stmt(
+        cls,
+        keys: tuple[str, ...],
+        rows: list[dict[str, Any]],
+        version_column: str | None,
+    ) -> Update:
+        """Build `UPDATE ... FROM (VALUES ...)` statement for `update_bulk`."""
+
+        table: Table = cls.model.__table__  # type: ignore[assignment]
+        data = values(
+            *(column(key, table.c[key].type) for key in keys), name="data"
+        ).data([tuple(row[key] for key in keys) for row in rows])
+
+        stmt = update(cls.model).where(table.c.id == data.c.id)
+        set_: dict[str, Any] = {
+            key: data.c[key] for key in keys if key not in ("id", version_column)
+        }
+        if version_column is not None:
+            stmt = stmt.where(table.c[version_column] == data.c[version_column])
+            set_[version_column] = table.c[version_column] + 1
+        return stmt.values(set_)
 
     # MARK: Delete
     @overload
@@ -341,6 +1632,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> None: ...
 
     @classmethod
+    @track_repository_call
     async def delete(
         cls,
         *where: _ColumnExpressionArgument[bool],
@@ -361,7 +1653,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 or `None` depends on `return_type` or if no record was found.
         """
 
-        if return_type is None:
+        if cls.cache is not None:
+            return await cls._execute_invalidating(
+                session, delete(cls.model).where(*where), return_type
+            )
+        elif return_type is None:
             stmt = delete(cls.model).where(*where)
             await session.execute(stmt)
             return None
@@ -372,26 +1668,257 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         return await session.scalar(stmt)
 
+    @classmethod
+    @track_repository_call
+    async def delete_in_batches(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        batch_size: int = api_constants.DEFAULT_BATCH_SIZE,
+        pause: float = 0,
+        on_progress: Callable[[int], Any] | None = None,
+    ) -> int:
+        """
+        Delete records matching `where` clauses in batches ordered by primary key.
+
+        Each batch locks its records with `FOR UPDATE SKIP LOCKED` and is committed
+        separately to keep locks and transactions short, records locked by other
+        transactions are skipped.
+
+        Note:
+        * The session is committed after every batch, including changes made before the call.
+
+        Args:
+            where: where clauses.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            batch_size(int): maximum number of records per batch.
+            pause(float): seconds to sleep between batches to spread the load.
+            on_progress(Callable[[int], Any] | None): called after every batch
+                with the total number of deleted records.
+
+        Returns:
+            int: number of deleted records.
+        """
+
+        def build_stmt(batch: CTE) -> ReturningDelete[Any]:
+            return (
+                delete(cls.model)
+                .where(cls.model.id == batch.c.id)  # type: ignore[attr-defined]
+                .returning(cls.model.id)  # type: ignore[attr-defined]
+            )
+
+        return await cls._run_in_batches(
+            where, session, batch_size, pause, on_progress, build_stmt
+        )
+
+    @classmethod
+    @track_repository_call
+    async def archive_in_batches(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        archive_table: Table | type[Base],
+        batch_size: int = api_constants.DEFAULT_BATCH_SIZE,
+        pause: float = 0,
+        on_progress: Callable[[int], Any] | None = None,
+    ) -> int:
+        """
+        Move records matching `where` clauses to `archive_table` in batches ordered by primary key.
+
+        Every batch is a single `WITH ... DELETE ... RETURNING` and `INSERT ... SELECT`
+        statement, so a record is never lost or duplicated. Batches lock and commit
+        like `delete_in_batches`.
+
+        Note:
+        * `archive_table` must have `id` column, only columns it shares with the model are copied.
+        * The session is committed after every batch, including changes made before the call.
+
+        Args:
+            where: where clauses.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+            archive_table(Table | type[Base]): table or model to move records to.
+            batch_size(int): maximum number of records per batch.
+            pause(float): seconds to sleep between batches to spread the load.
+            on_progress(Callable[[int], Any] | None): called after every batch
+                with the total number of archived records.
+
+        Returns:
+            int: number of archived records.
+        """
+
+        table: Table = cls.model.__table__  # type: ignore[assignment]
+        archive: Table = (
+            archive_table
+            if isinstance(archive_table, Table)
+            else archive_table.__table__  # type: ignore[assignment]
+        )
+        names = [name for name in archive.c.keys() if name in table.c]
+
+        def build_stmt(batch: CTE) -> ReturningInsert[Any]:
+            moved = (
+                delete(table)
+                .where(table.c.id == batch.c.id)
+                .returning(*(table.c[name] for name in names))
+                .cte("moved")
+            )
+            return (
+                insert(archive)
+                .from_select(names, select(*(moved.c[name] for name in names)))
+                .add_cte(moved)
+                .returning(archive.c.id)
+            )
+
+        return await cls._run_in_batches(
+            where, session, batch_size, pause, on_progress, build_stmt
+        )
+
+    @classmethod
+    async def _run_in_batches(
+        cls,
+        where: tuple[_ColumnExpressionArgument[bool], ...],
+        session: AsyncSession,
+        batch_size: int,
+        pause: float,
+        on_progress: Callable[[int], Any] | None,
+        build_stmt: Callable[[CTE], ReturningDelete[Any] | ReturningInsert[Any]],
+    ) -> int:
+        """
+        Execute batch statements of `delete_in_batches` and `archive_in_batches`
+        until no records are left, committing every batch.
+        """
+
+        total = 0
+        while True:
+            batch = (
+                select(cls.model.id)  # type: ignore[attr-defined]
+                .where(*where)
+                .order_by(cls.model.id)  # type: ignore[attr-defined]
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .cte("batch")
+            )
+            ids = list((await session.execute(build_stmt(batch))).scalars().all())
+            if not ids:
+                return total
+
+            await cls.invalidate_cache(session, ids)
+            await session.commit()
+            total += len(ids)
+            if on_progress is not None:
+                on_progress(total)
+            if pause:
+                await asyncio.sleep(pause)
+
     # MARK: Count
+    @overload
     @classmethod
     async def count(
-        cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
-    ) -> int:
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        estimate: Literal[False] = False,
+        exact_threshold: int = api_constants.DEFAULT_COUNT_EXACT_THRESHOLD,
+    ) -> int: ...
+    @overload
+    @classmethod
+    async def count(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        estimate: Literal[True],
+        exact_threshold: int = api_constants.DEFAULT_COUNT_EXACT_THRESHOLD,
+    ) -> tuple[int, bool]: ...
+
+    @classmethod
+    @track_repository_call
+    async def count(
+        cls,
+        *where: _ColumnExpressionArgument[bool],
+        session: AsyncSession,
+        estimate: bool = False,
+        exact_threshold: int = api_constants.DEFAULT_COUNT_EXACT_THRESHOLD,
+    ) -> int | tuple[int, bool]:
         """
         Count rows in the database matching `where` clauses.
 
+        With `estimate=True` the count is taken from `pg_class.reltuples`
+        if there are no `where` clauses, or from the planner row estimate
+        of `EXPLAIN (FORMAT JSON)` otherwise, without scanning the table.
+        If the estimate is below `exact_threshold`, rows are counted exactly.
+
         Args:
             where: where clauses.
             session(AsyncSession): Asynchronous SQLAlchemy session.
+            estimate(bool): return an estimated count for big tables.
+            exact_threshold(int): estimated count below which rows are counted exactly.
 
         Returns:
             rows_count: number of rows found, or 0 if no matches were found.
+                With `estimate=True` a tuple of the count and `True` if the count is exact.
         """
 
-        stmt = select(func.count()).select_from(cls.model).where(*where)
-        return await session.scalar(stmt) or 0
+        stmt = cls._statement(
+            "count",
+            lambda: (
+                select(func.count())
+                .select_from(cls.model)
+                .execution_options(**_REPLICA_OPTIONS)
+            ),
+        )
+        if where:
+            stmt = stmt.where(*where)
+        if not estimate:
+            return await session.scalar(stmt) or 0
+
+        estimated_count = await cls._estimate_count(where, session=session)
+        if estimated_count is None or estimated_count < exact_threshold:
+            return await session.scalar(stmt) or 0, True
+        return estimated_count, False
+
+    @classmethod
+    async def _estimate_count(
+        cls, where: tuple[_ColumnExpressionArgument[bool], ...], session: AsyncSession
+    ) -> int | None:
+        """
+        Return the planner estimate of rows matching `where` clauses.
+
+        Returns `None` if the table has never been analyzed
+        or `where` clauses can't be rendered with literal values.
+        """
+
+        table: Table = cls.model.__table__  # type: ignore[assignment]
+        if not where:
+            table_name = table.name if table.schema is None else table.fullname
+            reltuples = await session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)")
+                .bindparams(name=table_name)
+                .execution_options(**_REPLICA_OPTIONS)
+            )
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+        try:
+            compiled = (
+                select(1)
+                .select_from(cls.model)
+                .where(*where)
+                .compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+            )
+        except CompileError:
+            return None
+
+        plan = await session.scalar(
+            text(f"EXPLAIN (FORMAT JSON) {compiled}").execution_options(
+                **_REPLICA_OPTIONS
+            )
+        )
+        if isinstance(plan, str):
+            plan = from_json(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     @classmethod
+    @track_repository_call
     async def count_from_stmt(
         cls, session: AsyncSession, count_stmt: Select[Tuple[int]]
     ) -> int:
@@ -407,10 +1934,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             rows_count: number of rows found, or 0 if no matches were found.
         """
 
+        count_stmt = count_stmt.execution_options(**_REPLICA_OPTIONS)
         return await session.scalar(count_stmt) or 0
 
     # MARK: Exists
     @classmethod
+    @track_repository_call
     async def check_if_exists(
         cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
     ) -> bool:
@@ -425,5 +1954,50 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             bool: `True` if record exists, `False` otherwise.
         """
 
-        stmt = select(1).select_from(cls.model).where(*where)
+        stmt = (
+            select(1)
+            .select_from(cls.model)
+            .where(*where)
+            .execution_options(**_REPLICA_OPTIONS)
+        )
         return bool(await session.scalar(stmt))
+
+    # MARK: Version
+    @classmethod
+    @track_repository_call
+    async def get_version(
+        cls, *where: _ColumnExpressionArgument[bool], session: AsyncSession
+    ) -> str | None:
+        """
+        Return a version of records matching `where` clauses or `None` if no record was found.
+
+        The version is an MD5 hash of primary keys and `version_column` values
+        (or whole rows) of the records computed by the database, so it changes
+        when a matching record is added, changed or deleted without loading records.
+        Use it as an `ETag` with `src.api_caching.CacheControl`.
+
+        Args:
+            where: where clauses.
+            session(AsyncSession): Asynchronous SQLAlchemy session.
+
+        Returns:
+            str|None: version of the records, or `None` if no records were found.
+        """
+
+        id_column: InstrumentedAttribute[Any] = cls.model.id  # type: ignore
+        value: ColumnElement[str]
+        if cls.version_column is None:
+            value = cast(cls.model.__table__.table_valued(), Text)  # type: ignore[attr-defined]
+        else:
+            value = func.concat(id_column, ":", getattr(cls.model, cls.version_column))
+
+        stmt = (
+            select(
+                func.md5(
+                    func.string_agg(value, aggregate_order_by(literal(","), id_column))
+                )
+            )
+            .where(*where)
+            .execution_options(**_REPLICA_OPTIONS)
+        )
+        return await session.scalar(stmt)
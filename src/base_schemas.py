@@ -19,3 +19,31 @@ class BaseListReadSchema(BaseModel):
     """Base schema for read data in list."""
 
     count: int = Field(description="Total count of the results matching query params")
+    is_count_exact: bool = Field(
+        default=True, description="`False` if `count` is the planner estimate"
+    )
+
+
+class BaseCursorQuerySchema(BaseModel):
+    """Base query params schema for keyset (cursor) pagination."""
+
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor from `next_cursor` or `prev_cursor` of the previous page",
+    )
+    limit: int = Field(
+        default=api_constants.DEFAULT_QUERY_LIMIT, gt=0, description="Query limit"
+    )
+    asc: bool = Field(default=True, description="Sorting order on a selected field")
+
+
+class BaseCursorListReadSchema(BaseModel):
+    """Base schema for read data in list with keyset (cursor) pagination."""
+
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page or `None` on the last page"
+    )
+    prev_cursor: str | None = Field(
+        default=None,
+        description="Cursor of the previous page or `None` on the first page",
+    )
@@ -0,0 +1,235 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+from pydantic_core import from_json, to_json
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func, select
+
+from src import api_constants
+from src.database import EngineLocal
+
+__all__ = [
+    "RepositoryCache",
+    "get_cache_stats",
+    "notify_invalidation",
+    "start_invalidation_listener",
+    "stop_invalidation_listener",
+]
+
+logger = logging.getLogger(__name__)
+
+
+# MARK: Cache
+class RepositoryCache:
+    """
+    In-process LRU cache with TTL for rows of a single model.
+
+    Values are dictionaries of column values keyed by a normalized lookup,
+    each entry is indexed by the primary key of its row for invalidation.
+
+    Attributes:
+        max_size (int): maximum number of entries, the least recently used is evicted first.
+        ttl (float): time to live of an entry in seconds.
+        hits (int): number of lookups served from the cache.
+        misses (int): number of lookups not found in the cache.
+        evictions (int): number of entries evicted because of `max_size` or `ttl`.
+        invalidations (int): number of entries removed by writes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = api_constants.CACHE_MAX_SIZE,
+        ttl: float = api_constants.CACHE_TTL,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, str, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._keys_by_id: dict[str, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Return column values cached under `key` or `None`."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, data = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def set(self, key: Hashable, id: Any, data: dict[str, Any]) -> None:
+        """Cache column values `data` of the row with primary key `id` under `key`."""
+
+        if key in self._entries:
+            self._remove(key)
+        elif len(self._entries) >= self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        self._entries[key] = (time.monotonic() + self.ttl, str(id), data)
+        self._keys_by_id.setdefault(str(id), set()).add(key)
+
+    def invalidate(self, ids: Iterable[Any] | None = None) -> None:
+        """Remove entries of rows with primary keys `ids` or all entries if `ids` is `None`."""
+
+        if ids is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_id.clear()
+            return
+
+        for id in ids:
+            for key in self._keys_by_id.pop(str(id), ()):
+                self._entries.pop(key, None)
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters and current size."""
+
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, id, _ = self._entries.pop(key)
+        keys = self._keys_by_id.get(id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[id]
+
+
+# MARK: Registry
+_caches: dict[str, RepositoryCache] = {}
+
+
+def register_cache(table_name: str, cache: RepositoryCache) -> None:
+    """Register `cache` of rows of `table_name` to receive invalidations from other workers."""
+
+    _caches[table_name] = cache
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Return counters of all repository caches keyed by table name."""
+
+    return {table_name: cache.stats() for table_name, cache in _caches.items()}
+
+
+# MARK: Invalidation
+def _notify_stmt(table_name: str, ids: list[Any] | None) -> Any:
+    """Return `SELECT pg_notify(...)` statement for `notify_invalidation`."""
+
+    payload = to_json({"table": table_name, "ids": ids}).decode()
+    if len(payload) > api_constants.CACHE_NOTIFY_MAX_PAYLOAD:
+        payload = to_json({"table": table_name, "ids": None}).decode()
+
+    return select(func.pg_notify(api_constants.CACHE_INVALIDATION_CHANNEL, payload))
+
+
+async def notify_invalidation(
+    session: AsyncSession, table_name: str, ids: list[Any] | None
+) -> None:
+    """
+    Notify all workers to invalidate cached rows with primary keys `ids` of `table_name`.
+
+    Postgres delivers the notification only when the session transaction is committed.
+    All rows are invalidated if `ids` is `None` or too many to fit in a notification.
+    """
+
+    await session.execute(_notify_stmt(table_name, ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any) -> None:
+    """Invalidate cached rows changed or deleted by the unit of work."""
+
+    if not _caches:
+        return
+
+    ids_by_table: dict[str, list[Any]] = {}
+    for instance in (*session.dirty, *session.deleted):
+        table_name = getattr(instance, "__tablename__", None)
+        if table_name in _caches:
+            ids_by_table.setdefault(table_name, []).append(instance.id)
+
+    for table_name, ids in ids_by_table.items():
+        _caches[table_name].invalidate(ids)
+        session.connection().execute(_notify_stmt(table_name, ids))
+
+
+def _on_notification(connection: Any, pid: int, channel: str, payload: str) -> None:
+    """asyncpg listener callback applying an invalidation from `notify_invalidation`."""
+
+    try:
+        message = from_json(payload)
+        cache = _caches.get(message["table"])
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Malformed cache invalidation payload: %s", payload)
+        return
+
+    if cache is not None:
+        cache.invalidate(message["ids"])
+
+
+_listener_connection: AsyncConnection | None = None
+
+
+async def start_invalidation_listener() -> None:
+    """
+    Start listening for cache invalidations from other workers.
+
+    Keeps one connection of `EngineLocal` pool checked out until
+    `stop_invalidation_listener` is called. Does nothing if no repository has a cache.
+    """
+
+    global _listener_connection
+
+    if not _caches or _listener_connection is not None:
+        return
+
+    _listener_connection = await EngineLocal.connect()
+    raw_connection = await _listener_connection.get_raw_connection()
+    await raw_connection.driver_connection.add_listener(  # type: ignore[union-attr]
+        api_constants.CACHE_INVALIDATION_CHANNEL, _on_notification
+    )
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop listening for cache invalidations and return the connection to the pool."""
+
+    global _listener_connection
+
+    if _listener_connection is None:
+        return
+
+    raw_connection = await _listener_connection.get_raw_connection()
+    await raw_connection.driver_connection.remove_listener(  # type: ignore[union-attr]
+        api_constants.CACHE_INVALIDATION_CHANNEL, _on_notification
+    )
+    await _listener_connection.close()
+    _listener_connection = None
@@ -1,11 +1,48 @@
-from sqlalchemy import AsyncAdaptedQueuePool, MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import itertools
+import logging
+import math
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Callable, Literal
+
+from sqlalchemy import Connection, Engine, MetaData, Select, TextClause, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql import ClauseElement, Executable
+from sqlalchemy.sql.elements import (
+    ReleaseSavepointClause,
+    RollbackToSavepointClause,
+    SavepointClause,
+)
 
 from src import api_constants
 from src.api_config import api_settings
+from src.api_exceptions import DeadlineExceededException
+from src.api_instrumentation import InstrumentedQueuePool, instrument_engine
 
-__all__ = ["Base", "EngineLocal", "SessionLocal"]
+__all__ = [
+    "Base",
+    "EngineLocal",
+    "ReadOnlySessionLocal",
+    "ReplicaEnginesLocal",
+    "SessionLocal",
+    "dispose_engines",
+    "register_warm_up_statement",
+    "statement_deadline",
+    "warm_up_engines",
+]
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -17,25 +54,318 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=api_constants.DB_NAMING_CONVENTION)
 
 
-EngineLocal = create_async_engine(
-    url=api_settings.DATABASE_URL,
-    pool_size=api_settings.POOL_SIZE,
-    max_overflow=api_settings.MAX_OVERFLOW,
-    poolclass=AsyncAdaptedQueuePool,
-    pool_pre_ping=False,
-    pool_recycle=api_constants.POOL_RECYCLE,
-    echo=True if api_settings.MODE == "LOCAL" else False,
-    connect_args={
+# MARK: Deadlines
+# Savepoint statements may run in an aborted transaction, e.g. to roll it back
+_SAVEPOINT_CLAUSES = (
+    SavepointClause,
+    RollbackToSavepointClause,
+    ReleaseSavepointClause,
+)
+
+_statement_deadline: ContextVar[float | None] = ContextVar(
+    "statement_deadline", default=None
+)
+
+
+@asynccontextmanager
+async def statement_deadline(seconds: float) -> AsyncGenerator[None, None]:
+    """
+    Limit statements executed inside the block to end within `seconds` from now.
+
+    The remaining time becomes `SET LOCAL statement_timeout` of the transaction
+    before the next statement, a nested block can only shorten the deadline.
+    Statements started after the deadline and statements cancelled by
+    the timeout raise `DeadlineExceededException`.
+
+    Args:
+        seconds(float): time limit of the block.
+    """
+
+    deadline = time.monotonic() + seconds
+    outer_deadline = _statement_deadline.get()
+    if outer_deadline is not None:
+        deadline = min(deadline, outer_deadline)
+
+    token = _statement_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _statement_deadline.reset(token)
+
+
+def _apply_statement_deadline(
+    conn: Connection, clauseelement: Executable, *args: Any
+) -> None:
+    """Set `statement_timeout` of the transaction to the time left until the deadline."""
+
+    if not conn.in_transaction() or isinstance(clauseelement, _SAVEPOINT_CLAUSES):
+        return
+
+    # SET LOCAL lasts until the end of the transaction
+    transaction = conn.get_transaction()
+    applied = conn.info.get(api_constants.STATEMENT_DEADLINE_CONNECTION_INFO)
+    applied_deadline = (
+        applied[1] if applied is not None and applied[0] is transaction else None
+    )
+    deadline = _statement_deadline.get()
+    if applied_deadline == deadline:
+        return
+
+    conn.info[api_constants.STATEMENT_DEADLINE_CONNECTION_INFO] = (
+        transaction,
+        deadline,
+    )
+    if deadline is None:
+        conn.exec_driver_sql("SET LOCAL statement_timeout TO DEFAULT")
+        return
+
+    timeout_ms = int((deadline - time.monotonic()) * 1000)
+    if timeout_ms <= 0:
+        raise DeadlineExceededException()
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def _forget_statement_deadline(conn: Connection, *args: Any) -> None:
+    """Mark `statement_timeout` unknown, a savepoint rollback may have reverted it."""
+
+    applied = conn.info.get(api_constants.STATEMENT_DEADLINE_CONNECTION_INFO)
+    if applied is not None:
+        conn.info[api_constants.STATEMENT_DEADLINE_CONNECTION_INFO] = (
+            applied[0],
+            math.nan,
+        )
+
+
+def _handle_query_canceled(context: ExceptionContext) -> BaseException | None:
+    """Raise `DeadlineExceededException` when a statement hits the deadline timeout."""
+
+    if (
+        _statement_deadline.get() is not None
+        and getattr(context.original_exception, "sqlstate", None)
+        == api_constants.QUERY_CANCELED_SQLSTATE
+    ):
+        return DeadlineExceededException()
+    return None
+
+
+# MARK: Engines
+def _prepared_statement_names() -> Callable[[], str]:
+    """
+    Return asyncpg `prepared_statement_name_func` safe behind a transaction pooler.
+
+    asyncpg names statements `__asyncpg_stmt_N__` counting from 1 on each connection,
+    so statements of clients sharing a server connection through the pooler collide.
+    Names here have a random prefix of the engine followed by a counter.
+    """
+
+    prefix = uuid.uuid4().hex[:12]
+    counter = itertools.count()
+    return lambda: f"__asyncpg_{prefix}_{next(counter)}__"
+
+
+def _create_engine(url: str, application_name: str, pool_name: str) -> AsyncEngine:
+    """
+    Create an `AsyncEngine` with the app pool and connection settings.
+
+    `pool_name` labels metrics of the engine pool.
+    """
+
+    connect_args: dict[str, Any] = {
         "server_settings": {
-            "application_name": f"{api_settings.APP_NAME}_{api_settings.MODE}"
-        }
-    },
+            "application_name": application_name,
+            "statement_timeout": str(api_settings.DB_STATEMENT_TIMEOUT_MS),
+        },
+        "prepared_statement_cache_size": api_settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if api_settings.DB_POOLER_PREPARED_STATEMENTS:
+        connect_args["prepared_statement_name_func"] = _prepared_statement_names()
+
+    engine = create_async_engine(
+        url=url,
+        pool_size=api_settings.POOL_SIZE,
+        max_overflow=api_settings.MAX_OVERFLOW,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=pool_name,
+        pool_pre_ping=False,
+        pool_recycle=api_constants.POOL_RECYCLE,
+        echo=True if api_settings.MODE == "LOCAL" else False,
+        connect_args=connect_args,
+    )
+    event.listen(engine.sync_engine, "before_execute", _apply_statement_deadline)
+    event.listen(engine.sync_engine, "rollback_savepoint", _forget_statement_deadline)
+    event.listen(engine.sync_engine, "handle_error", _handle_query_canceled)
+    if api_settings.DB_INSTRUMENTATION:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+
+EngineLocal = _create_engine(
+    url=api_settings.DATABASE_URL,
+    application_name=f"{api_settings.APP_NAME}_{api_settings.MODE}",
+    pool_name="primary",
+)
+
+ReplicaEnginesLocal: tuple[AsyncEngine, ...] = tuple(
+    _create_engine(
+        url=url,
+        application_name=f"{api_settings.APP_NAME}_{api_settings.MODE}_replica",
+        pool_name=f"replica_{number}",
+    )
+    for number, url in enumerate(api_settings.REPLICA_DATABASE_URLS)
 )
 
+
+# MARK: Replicas
+class ReplicaSelector:
+    """
+    Chooses a read replica engine for a new session.
+
+    Attributes:
+        engines (tuple[AsyncEngine, ...]): replica engines, may be empty.
+        strategy (Literal["round_robin", "least_busy"]):
+            take replicas in turn or the one with the fewest checked out connections.
+    """
+
+    def __init__(
+        self,
+        engines: tuple[AsyncEngine, ...],
+        strategy: Literal["round_robin", "least_busy"],
+    ) -> None:
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(engines)
+
+    def choose(self) -> AsyncEngine | None:
+        """Return a replica engine or `None` if there are no replicas."""
+
+        if not self.engines:
+            return None
+        elif self.strategy == "least_busy":
+            return min(self.engines, key=lambda engine: engine.pool.checkedout())  # type: ignore[attr-defined]
+        return next(self._cycle)
+
+
+replica_selector = ReplicaSelector(
+    engines=ReplicaEnginesLocal, strategy=api_settings.REPLICA_SELECTION
+)
+
+
+class RoutingSession(Session):
+    """
+    `Session` that sends reads to a read replica and everything else to the primary.
+
+    Every statement of a read-only session goes to a replica. Other sessions send
+    a statement there only if it has `READ_REPLICA_OPTION` execution option set.
+    Once the session flushes or executes anything but `SELECT` or a statement
+    with `READ_REPLICA_OPTION` on the primary, it is pinned to the primary,
+    so later reads see its own writes.
+    A session uses a single replica chosen at its first replica read.
+    """
+
+    def get_bind(
+        self, mapper: Any = None, *, clause: ClauseElement | None = None, **kw: Any
+    ) -> Engine | Connection:
+        if isinstance(self.bind, Connection) or not replica_selector.engines:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        read_only = self.info.get(api_constants.READ_ONLY_SESSION_INFO, False)
+        replica_read = isinstance(clause, (Select, TextClause)) and bool(
+            clause.get_execution_options().get(api_constants.READ_REPLICA_OPTION)
+        )
+        if not read_only and (
+            self._flushing or not (isinstance(clause, Select) or replica_read)
+        ):
+            self.info[api_constants.PINNED_TO_PRIMARY_INFO] = True
+        elif read_only or (
+            replica_read and not self.info.get(api_constants.PINNED_TO_PRIMARY_INFO)
+        ):
+            if api_constants.REPLICA_ENGINE_INFO not in self.info:
+                self.info[api_constants.REPLICA_ENGINE_INFO] = replica_selector.choose()
+            return self.info[api_constants.REPLICA_ENGINE_INFO].sync_engine
+
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
 SessionLocal = async_sessionmaker(
     bind=EngineLocal,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
 )
+
+ReadOnlySessionLocal = async_sessionmaker(
+    bind=EngineLocal,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    info={api_constants.READ_ONLY_SESSION_INFO: True},
+)
+
+
+# MARK: Warm-up
+_warm_up_statements: list[tuple[Executable, dict[str, Any]]] = []
+
+
+def register_warm_up_statement(
+    statement: Executable, parameters: dict[str, Any] | None = None
+) -> None:
+    """
+    Register a hot read-only statement to be prepared on every connection at warm-up.
+
+    asyncpg caches prepared statements per connection, so executing the statement once
+    on each pooled connection saves the prepare round trip of its first real use.
+
+    Args:
+        statement(Executable): `SELECT` statement, it is executed during warm-up.
+        parameters(dict[str, Any] | None): values of bound parameters of the statement.
+    """
+
+    _warm_up_statements.append((statement, parameters or {}))
+
+
+async def _open_warm_connection(engine: AsyncEngine) -> AsyncConnection:
+    connection = await engine.connect()
+    try:
+        for statement, parameters in _warm_up_statements:
+            await connection.execute(statement, parameters)
+    except Exception:
+        await connection.close()
+        raise
+    return connection
+
+
+async def _warm_up_engine(engine: AsyncEngine) -> None:
+    results = await asyncio.gather(
+        *(_open_warm_connection(engine) for _ in range(api_settings.POOL_SIZE)),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("Failed to warm up a connection: %r", result)
+        else:
+            await result.close()
+
+
+async def warm_up_engines() -> None:
+    """
+    Open `POOL_SIZE` connections of the primary and every replica pool concurrently.
+
+    Registered warm-up statements are prepared on each connection. Failures are logged,
+    so the app still starts if the database is temporarily unavailable.
+    """
+
+    await asyncio.gather(
+        *(_warm_up_engine(engine) for engine in (EngineLocal, *ReplicaEnginesLocal))
+    )
+
+
+async def dispose_engines() -> None:
+    """Close all connections of the primary and replica pools."""
+
+    await asyncio.gather(
+        *(engine.dispose() for engine in (EngineLocal, *ReplicaEnginesLocal))
+    )
@@ -1,8 +1,8 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import SessionLocal
+from src.database import ReadOnlySessionLocal, SessionLocal, statement_deadline
 
 
 # MARK: Session
@@ -22,3 +22,37 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
         except Exception as ex:
             raise ex
+
+
+async def get_read_only_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    AsyncGenerator of a read-only `AsyncSession` instance.
+
+    Note:
+    * All statements go to a read replica, or to the primary if there are no replicas.
+    * Data written by other sessions may not be visible yet because of replication lag,
+    use `get_session` when the request has to read its own writes.
+    """
+
+    async with ReadOnlySessionLocal() as session:
+        try:
+            yield session
+        except Exception as ex:
+            raise ex
+
+
+# MARK: Deadline
+def route_deadline(seconds: float) -> Callable[[], AsyncGenerator[None, None]]:
+    """
+    Return a dependency limiting database statements of the route
+    to end within `seconds` from the start of the request.
+
+    Usage:
+        `@router.get(path="", dependencies=[Depends(route_deadline(2))])`
+    """
+
+    async def deadline() -> AsyncGenerator[None, None]:
+        async with statement_deadline(seconds):
+            yield
+
+    return deadline
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.api_config import api_settings
+from src.api_lifecycle import app_lifecycle
+from src.database import EngineLocal, ReplicaEnginesLocal
+from src.healthcheck.schemas import ReadinessSchema
+
+__all__ = ["ReadinessProbe", "readiness_probe"]
+
+logger = logging.getLogger(__name__)
+
+# Replay lag is 0 while the replica has applied everything it received,
+# otherwise the age of the last replayed transaction.
+_REPLICA_LAG_STMT = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReadinessProbe:
+    """
+    Readiness check of the app, the database pool, read replicas and the event loop.
+
+    The result is cached for `ttl` seconds and concurrent callers share a single
+    in-flight check, so probes add at most one connection checkout per primary
+    and replica pool per `ttl` window whatever their number.
+
+    Attributes:
+        ttl (float): time to live of the result in seconds.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._result: ReadinessSchema | None = None
+        self._expires_at = 0.0
+        self._task: asyncio.Task[ReadinessSchema] | None = None
+
+    async def check(self) -> ReadinessSchema:
+        """Return the cached result or run a check shared by concurrent callers."""
+
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._check())
+            self._task.add_done_callback(self._on_done)
+        # The check goes on for other callers if this one is cancelled
+        return await asyncio.shield(self._task)
+
+    def clear(self) -> None:
+        """Forget the cached result."""
+
+        self._result = None
+
+    def _on_done(self, task: asyncio.Task[ReadinessSchema]) -> None:
+        self._task = None
+        if not task.cancelled() and task.exception() is None:
+            self._result = task.result()
+            self._expires_at = time.monotonic() + self.ttl
+
+    async def _check(self) -> ReadinessSchema:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        await asyncio.sleep(0)
+        event_loop_lag = loop.time() - started_at
+
+        pool_usage = EngineLocal.pool.checkedout() / (  # type: ignore[attr-defined]
+            api_settings.POOL_SIZE + api_settings.MAX_OVERFLOW
+        )
+        database, replica_lags = await asyncio.gather(
+            self._check_primary(pool_usage), self._get_replica_lags()
+        )
+
+        return ReadinessSchema(
+            ready=(
+                app_lifecycle.is_ready
+                and database
+                and event_loop_lag <= api_settings.READINESS_MAX_EVENT_LOOP_LAG
+                and all(
+                    lag is not None and lag <= api_settings.READINESS_MAX_REPLICA_LAG
+                    for lag in replica_lags
+                )
+            ),
+            database=database,
+            pool_usage=round(pool_usage, 3),
+            replica_lags=replica_lags,
+            event_loop_lag=round(event_loop_lag, 6),
+            checked_at=datetime.now(UTC),
+        )
+
+    async def _check_primary(self, pool_usage: float) -> bool:
+        # A saturated pool would make the check wait for a connection
+        if pool_usage >= api_settings.READINESS_MAX_POOL_USAGE:
+            return False
+
+        try:
+            async with asyncio.timeout(api_settings.READINESS_TIMEOUT):
+                async with EngineLocal.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except Exception as ex:
+            logger.warning("Readiness check of the database failed: %r", ex)
+            return False
+        return True
+
+    async def _get_replica_lags(self) -> list[float | None]:
+        return list(
+            await asyncio.gather(
+                *(self._get_replica_lag(engine) for engine in ReplicaEnginesLocal)
+            )
+        )
+
+    async def _get_replica_lag(self, engine: AsyncEngine) -> float | None:
+        try:
+            async with asyncio.timeout(api_settings.READINESS_TIMEOUT):
+                async with engine.connect() as connection:
+                    lag = await connection.scalar(_REPLICA_LAG_STMT)
+        except Exception as ex:
+            logger.warning("Readiness check of a read replica failed: %r", ex)
+            return None
+        return float(lag)
+
+
+readiness_probe = ReadinessProbe(ttl=api_settings.READINESS_CACHE_TTL)
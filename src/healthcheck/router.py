@@ -1,6 +1,9 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
-from src.healthcheck.schemas import HealthCheckSchema
+from src.api_exceptions import AppNotReadyException
+from src.api_lifecycle import app_lifecycle
+from src.healthcheck.readiness import readiness_probe
+from src.healthcheck.schemas import HealthCheckSchema, ReadinessSchema
 
 __all__ = ["healthcheck_router"]
 
@@ -12,9 +15,41 @@ healthcheck_router = APIRouter(prefix="/healthcheck", tags=["Check API status"])
     summary="Check API status",
     response_model=None,
     status_code=status.HTTP_200_OK,
-    responses={status.HTTP_200_OK: {"model": HealthCheckSchema}},
+    responses={
+        status.HTTP_200_OK: {"model": HealthCheckSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": AppNotReadyException.default_message
+        },
+    },
 )
 async def healthcheck() -> HealthCheckSchema:
-    """Check API status."""
+    """Check API status. The app is not ready while it warms up or drains requests."""
+
+    if not app_lifecycle.is_ready:
+        raise AppNotReadyException()
 
     return HealthCheckSchema()
+
+
+@healthcheck_router.get(
+    path="/readiness",
+    summary="Check API readiness",
+    response_model=None,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": ReadinessSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessSchema},
+    },
+)
+async def readiness(response: Response) -> ReadinessSchema:
+    """
+    Check whether the app can serve requests: the database answers, its pool isn't
+    saturated, read replicas aren't lagging and the event loop isn't blocked.
+    The result is cached for `READINESS_CACHE_TTL` seconds.
+    """
+
+    readiness_data = await readiness_probe.check()
+    if not readiness_data.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return readiness_data
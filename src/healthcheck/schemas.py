@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -16,3 +17,21 @@ class HealthCheckSchema(BaseModel):
         description="API version. Corresponds to the latest commit hash",
     )
     status: str = Field(default="OK", description="API status")
+
+
+class ReadinessSchema(BaseModel):
+    """Schema for API readiness response."""
+
+    ready: bool = Field(description="Whether the app can serve requests")
+    database: bool = Field(
+        description="Whether the primary database answers `SELECT 1`"
+    )
+    pool_usage: float = Field(
+        description="Share of checked out connections of the primary pool including overflow"
+    )
+    replica_lags: list[float | None] = Field(
+        default=[],
+        description="Replication lag of each read replica in seconds, `null` if unreachable",
+    )
+    event_loop_lag: float = Field(description="Event loop scheduling delay in seconds")
+    checked_at: datetime = Field(description="Time of the check, results are cached")
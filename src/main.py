@@ -1,10 +1,54 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
-from src import api_constants
+from src import api_constants, cache
 from src.api_config import api_settings
+from src.api_lifecycle import app_lifecycle
+from src.api_middlewares import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    DBTimingMiddleware,
+    DisconnectMiddleware,
+    ETagMiddleware,
+    LifecycleMiddleware,
+    MetricsMiddleware,
+)
+from src.api_responses import FastJSONResponse
+from src.database import dispose_engines, warm_up_engines
 from src.healthcheck.router import healthcheck_router
+from src.metrics.collectors import mark_process_dead
+from src.metrics.router import metrics_router
+from src.write_buffer import flush_write_buffers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """
+    Warm up and shut down the app.
+
+    Pool connections are opened before the app is reported ready. At shutdown
+    new requests are rejected, in-flight requests are drained, write buffers
+    are flushed and pools are disposed.
+    """
+
+    app_lifecycle.state = "warming_up"
+    await cache.start_invalidation_listener()
+    if api_settings.POOL_WARM_UP:
+        await warm_up_engines()
+    app_lifecycle.state = "ready"
+
+    yield
+
+    await app_lifecycle.drain(timeout=api_settings.DRAIN_TIMEOUT)
+    await flush_write_buffers()
+    await cache.stop_invalidation_listener()
+    await dispose_engines()
+    mark_process_dead()
+
 
 app = FastAPI(
     title=api_settings.APP_NAME,
@@ -17,6 +61,8 @@ app = FastAPI(
     docs_url="/docs" if api_settings.MODE != "PROD" else None,
     redoc_url="/redoc" if api_settings.MODE != "PROD" else None,
     openapi_url="/openapi.json" if api_settings.MODE != "PROD" else None,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 
@@ -26,9 +72,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=api_constants.CORS_METHODS,
 )
+if api_settings.RESPONSE_ETAGS:
+    app.add_middleware(ETagMiddleware)
+if api_settings.RESPONSE_COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=api_settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=api_settings.COMPRESSION_CONTENT_TYPES,
+        levels={
+            "gzip": api_settings.COMPRESSION_GZIP_LEVEL,
+            "br": api_settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd": api_settings.COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+app.add_middleware(DisconnectMiddleware)
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_concurrency=api_settings.ADMISSION_CONCURRENCY_LIMIT,
+    queue_size=api_settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=api_settings.ADMISSION_QUEUE_TIMEOUT,
+    route_priorities=api_settings.ADMISSION_ROUTE_PRIORITIES,
+    exempt_paths=api_settings.ADMISSION_EXEMPT_PATHS,
+    retry_after=api_settings.ADMISSION_RETRY_AFTER,
+)
+app.add_middleware(LifecycleMiddleware)
+app.add_middleware(MetricsMiddleware)
+if api_settings.DB_INSTRUMENTATION:
+    app.add_middleware(DBTimingMiddleware)
 
 
-routers = (healthcheck_router,)
+routers = (healthcheck_router, metrics_router)
 for router in routers:
     app.include_router(router=router, prefix="/api/v1")
 
@@ -0,0 +1,115 @@
+import functools
+import os
+import time
+from typing import Any, Callable, Coroutine, ParamSpec, TypeVar
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+
+__all__ = [
+    "POOL_CHECKED_OUT",
+    "POOL_CHECKOUT_WAIT",
+    "POOL_OVERFLOW",
+    "POOL_SIZE",
+    "REQUESTS_IN_FLIGHT",
+    "REQUEST_LATENCY",
+    "REPOSITORY_CALL_LATENCY",
+    "get_registry",
+    "mark_process_dead",
+    "track_repository_call",
+]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Values of metrics are kept in files of `PROMETHEUS_MULTIPROC_DIR` if it is set,
+# so every uvicorn worker writes its own file and a scrape aggregates all of them.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+# MARK: Pool
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Number of connections kept in the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Number of connections checked out from the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Number of open overflow connections above the pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# MARK: Requests
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route template.",
+    ["method", "route", "status_code"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Number of HTTP requests being processed.",
+    multiprocess_mode="livesum",
+)
+
+# MARK: Repositories
+REPOSITORY_CALL_LATENCY = Histogram(
+    "repository_call_duration_seconds",
+    "Number and latency of `BaseRepository` method calls.",
+    ["repository", "method"],
+)
+
+
+def track_repository_call(
+    func: Callable[P, Coroutine[Any, Any, R]],
+) -> Callable[P, Coroutine[Any, Any, R]]:
+    """Decorator of `BaseRepository` coroutine class methods observing calls in `REPOSITORY_CALL_LATENCY`."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        started_at = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            REPOSITORY_CALL_LATENCY.labels(
+                getattr(args[0], "__name__", "unknown"), func.__name__
+            ).observe(time.perf_counter() - started_at)
+
+    return wrapper
+
+
+# MARK: Registry
+def get_registry() -> CollectorRegistry:
+    """Return the registry to export, aggregating all workers in multiprocess mode."""
+
+    if MULTIPROC_DIR is None:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+    return registry
+
+
+def mark_process_dead() -> None:
+    """Remove live gauges of the current worker in multiprocess mode."""
+
+    if MULTIPROC_DIR is not None:
+        multiprocess.mark_process_dead(os.getpid(), path=MULTIPROC_DIR)
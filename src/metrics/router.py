@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.metrics.collectors import get_registry
+
+__all__ = ["metrics_router"]
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@metrics_router.get(
+    path="",
+    summary="Export metrics",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"content": {CONTENT_TYPE_LATEST: {}}}},
+)
+def metrics() -> Response:
+    """Export metrics of all workers in Prometheus text format."""
+
+    return Response(
+        content=generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from typing import Any, AsyncContextManager, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants
+from src.database import Base, SessionLocal
+
+__all__ = ["WriteBuffer", "flush_write_buffers"]
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    """
+    Opt-in per-model buffer merging inserts of concurrent requests into multi-row `INSERT`s.
+
+    Rows are flushed when the buffer has `max_rows` rows or `max_delay` seconds
+    after the first buffered row, whichever comes first. A flush inserts and
+    commits rows in its own session, so buffered rows are independent
+    of the caller's transaction and are visible to others only after the flush.
+    Assign an instance to `BaseRepository.write_buffer` and add rows with
+    `BaseRepository.add_buffered`.
+
+    Attributes:
+        max_rows (int): number of rows that triggers a flush.
+        max_delay (float): maximum time a row waits for a flush in seconds.
+        session_factory (Callable[[], AsyncContextManager[AsyncSession]]):
+            factory of sessions used by flushes.
+        model (type[Base] | None): model of the buffered rows, set by `BaseRepository`.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = api_constants.WRITE_BUFFER_MAX_ROWS,
+        max_delay: float = api_constants.WRITE_BUFFER_MAX_DELAY,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]] = SessionLocal,
+    ) -> None:
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.session_factory = session_factory
+        self.model: type[Base] | None = None
+        self._rows: list[tuple[dict[str, Any], asyncio.Future[Any]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def bind(self, model: type[Base]) -> None:
+        """Set the model of buffered rows and register the buffer for `flush_write_buffers`."""
+
+        self.model = model
+        _buffers.add(self)
+
+    def add(self, row: dict[str, Any]) -> asyncio.Future[Any]:
+        """
+        Buffer a row for insert.
+
+        Args:
+            row(dict[str, Any]): column values of the row.
+
+        Returns:
+            asyncio.Future[Any]: `id` of the inserted row or the error of the flush.
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._rows.append((row, future))
+        if len(self._rows) >= self.max_rows:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return future
+
+    async def flush(self) -> None:
+        """Flush buffered rows and wait for all flushes in progress."""
+
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+        task = asyncio.get_running_loop().create_task(self._flush(rows))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(
+        self, rows: list[tuple[dict[str, Any], asyncio.Future[Any]]]
+    ) -> None:
+        if self.model is None:
+            raise RuntimeError("WriteBuffer is not bound to a model")
+
+        # Rows of an executemany must have the same columns
+        rows_by_columns: dict[
+            frozenset[str], list[tuple[dict[str, Any], asyncio.Future[Any]]]
+        ] = {}
+        for row, future in rows:
+            rows_by_columns.setdefault(frozenset(row), []).append((row, future))
+
+        # insertmanyvalues renders multi-row VALUES, sorted RETURNING matches ids to rows
+        stmt = insert(self.model).returning(
+            self.model.id,  # type: ignore[attr-defined]
+            sort_by_parameter_order=True,
+        )
+        try:
+            async with self.session_factory() as session:
+                results = []
+                for group in rows_by_columns.values():
+                    result = await session.execute(stmt, [row for row, _ in group])
+                    results.append((group, result.scalars().all()))
+                await session.commit()
+        except Exception as ex:
+            logger.warning(
+                "Failed to flush %s rows of %s: %r",
+                len(rows),
+                self.model.__tablename__,
+                ex,
+            )
+            for _, future in rows:
+                if not future.done():
+                    future.set_exception(ex)
+            return
+
+        for group, ids in results:
+            for (_, future), id in zip(group, ids, strict=True):
+                if not future.done():
+                    future.set_result(id)
+
+
+_buffers: set[WriteBuffer] = set()
+
+
+async def flush_write_buffers() -> None:
+    """Flush rows of all write buffers, called at shutdown."""
+
+    await asyncio.gather(*(buffer.flush() for buffer in _buffers))
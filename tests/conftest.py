@@ -12,6 +12,48 @@ __all__ = ["faker"]
 faker = Faker()
 
 
+# MARK: Benchmarks
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run benchmarks marked with `pytest.mark.benchmark`",
+    )
+    parser.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="Save benchmark results as the new baselines",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.5,
+        help="Relative regression from the baseline that fails a benchmark",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "benchmark: slow performance benchmark, run with `--benchmark`"
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless `--benchmark` is passed."""
+
+    if config.getoption("--benchmark"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="Benchmarks run only with `--benchmark`")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 # MARK: DBSession
 @pytest.fixture()
 async def session() -> AsyncGenerator[AsyncSession, None]:
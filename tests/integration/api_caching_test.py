@@ -0,0 +1,89 @@
+import uuid
+
+import httpx
+import pytest_asyncio
+from fastapi import APIRouter, Depends, FastAPI, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api_caching import CacheControl, ConditionalRequest, etag_matches
+from src.dependencies import get_session
+from tests.conftest import faker
+from tests.integration.conftest import RepositoryTestModel, RepositoryTestRepository
+
+router = APIRouter(prefix="/items")
+item_cache_control = CacheControl(max_age=5)
+
+
+@router.get(path="/{item_id}", response_model=None)
+async def get_item(
+    item_id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    conditional: ConditionalRequest = Depends(item_cache_control),
+) -> dict[str, str]:
+    conditional.check(
+        await RepositoryTestRepository.get_version(
+            RepositoryTestModel.id == item_id, session=session
+        )
+    )
+
+    item = await RepositoryTestRepository.get_exactly_one(
+        RepositoryTestModel.id == item_id, session=session
+    )
+    return {"name": item.name}
+
+
+class TestCacheControl:
+    """Class for testing src.api_caching.CacheControl."""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def client(self, repository_session: AsyncSession):
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_session] = lambda: repository_session
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+            yield async_client
+
+    async def test_not_modified(
+        self, client: httpx.AsyncClient, repository_session: AsyncSession
+    ):
+        """Answers a matching `If-None-Match` with 304 before loading the record."""
+
+        item = await RepositoryTestRepository.add(
+            repository_session, {"name": faker.name(), "number": 1}
+        )
+
+        response = await client.get(f"/items/{item.id}")
+        etag = response.headers["ETag"]
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Cache-Control"] == "private, max-age=5"
+
+        response = await client.get(
+            f"/items/{item.id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.headers["Cache-Control"] == "private, max-age=5"
+        assert response.content == b""
+
+        await RepositoryTestRepository.update(
+            RepositoryTestModel.id == item.id,
+            session=repository_session,
+            update_data={"name": faker.name()},
+        )
+        response = await client.get(
+            f"/items/{item.id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_etag_matches(self):
+        """Compares ETags weakly and accepts lists and `*`."""
+
+        assert etag_matches('W/"a", "b"', 'W/"b"')
+        assert etag_matches("*", 'W/"b"')
+        assert not etag_matches('W/"a"', 'W/"b"')
+        assert not etag_matches(None, 'W/"b"')
@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import zlib
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api_admission import AdmissionController
+from src.api_config import api_settings
+from src.api_middlewares import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    DBTimingMiddleware,
+    DisconnectMiddleware,
+    ETagMiddleware,
+)
+
+
+class TestDBTimingMiddleware:
+    """Class for testing src.api_middlewares.DBTimingMiddleware."""
+
+    @staticmethod
+    def get_client(session: AsyncSession, statements: int) -> httpx.AsyncClient:
+        app = FastAPI()
+        app.add_middleware(DBTimingMiddleware)
+
+        @app.get("/")
+        async def execute() -> None:
+            for number in range(statements):
+                await session.execute(
+                    text("SELECT CAST(:number AS integer)"), {"number": number}
+                )
+
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        )
+
+    async def test_server_timing(self, session: AsyncSession):
+        """Adds database usage of the request to `Server-Timing` header."""
+
+        async with self.get_client(session, statements=3) as client:
+            response = await client.get("/")
+
+        assert response.status_code == status.HTTP_200_OK
+        metrics = response.headers["Server-Timing"].split(", ")
+        assert [metric.split(";")[0] for metric in metrics] == [
+            "db",
+            "db-pool",
+            "db-slowest",
+        ]
+        # The session may also issue a SAVEPOINT of the test transaction
+        statements = int(metrics[0].split('desc="')[1].split()[0])
+        assert statements >= 3
+
+    async def test_n_plus_one_warning(
+        self,
+        session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """Warns once when a statement shape is repeated more than the threshold."""
+
+        monkeypatch.setattr(api_settings, "DB_N_PLUS_ONE_THRESHOLD", 2)
+        with caplog.at_level(logging.WARNING, logger="src.api_instrumentation"):
+            async with self.get_client(session, statements=5) as client:
+                await client.get("/")
+
+        warnings = [r for r in caplog.records if "N+1" in r.getMessage()]
+        assert len(warnings) == 1
+
+
+class TestAdmissionControlMiddleware:
+    """Class for testing src.api_middlewares.AdmissionControlMiddleware."""
+
+    async def test_overload(self):
+        """Rejects requests with `Retry-After` when the wait queue is full."""
+
+        release = asyncio.Event()
+        app = FastAPI()
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            max_concurrency=1,
+            queue_size=1,
+            queue_timeout=5,
+            route_priorities={},
+            exempt_paths=["/exempt"],
+            retry_after=3,
+        )
+
+        @app.get("/")
+        async def wait() -> None:
+            await release.wait()
+
+        @app.get("/exempt")
+        async def exempt() -> None:
+            pass
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            running = asyncio.create_task(client.get("/"))
+            queued = asyncio.create_task(client.get("/"))
+            await asyncio.sleep(0.05)
+
+            response = await client.get("/")
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.headers["Retry-After"] == "3"
+
+            response = await client.get("/exempt")
+            assert response.status_code == status.HTTP_200_OK
+
+            release.set()
+            for task in (running, queued):
+                assert (await task).status_code == status.HTTP_200_OK
+
+    async def test_priorities(self):
+        """Hands a released slot over to the waiter with the highest priority."""
+
+        controller = AdmissionController(limit=1, queue_size=10, queue_timeout=5)
+        assert await controller.acquire()
+
+        order = []
+
+        async def wait(priority: int):
+            assert await controller.acquire(priority)
+            order.append(priority)
+            controller.release()
+
+        tasks = [asyncio.create_task(wait(priority)) for priority in (0, 2, 1)]
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(*tasks)
+
+        assert order == [2, 1, 0]
+        assert controller.active == 0
+        assert controller.queued == 0
+
+    async def test_queue_timeout(self):
+        """Rejects a waiter after the queue timeout."""
+
+        controller = AdmissionController(limit=1, queue_size=10, queue_timeout=0.01)
+        assert await controller.acquire()
+        assert not await controller.acquire()
+        assert controller.queued == 0
+
+
+class TestDisconnectMiddleware:
+    """Class for testing src.api_middlewares.DisconnectMiddleware."""
+
+    async def test_cancel_on_disconnect(self):
+        """Cancels the handler when the client disconnects."""
+
+        cancelled = asyncio.Event()
+
+        async def app(scope, receive, send):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        messages = [
+            {"type": "http.request", "body": b"", "more_body": False},
+            {"type": "http.disconnect"},
+        ]
+
+        async def receive():
+            await asyncio.sleep(0.01)
+            return messages.pop(0)
+
+        async def send(message):
+            pass
+
+        scope = {"type": "http", "method": "GET", "path": "/"}
+        await asyncio.wait_for(DisconnectMiddleware(app)(scope, receive, send), 1)
+        assert cancelled.is_set()
+
+
+class TestETagMiddleware:
+    """Class for testing src.api_middlewares.ETagMiddleware."""
+
+    async def test_not_modified(self):
+        """Adds a body hash `ETag` and answers a matching `If-None-Match` with 304."""
+
+        app = FastAPI()
+        app.add_middleware(ETagMiddleware)
+        data = {"name": "first"}
+
+        @app.get("/")
+        async def get_data() -> dict[str, str]:
+            return data
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get("/")
+            etag = response.headers["ETag"]
+            assert response.status_code == status.HTTP_200_OK
+            assert etag.startswith('W/"')
+
+            response = await client.get("/", headers={"If-None-Match": etag})
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+            data["name"] = "second"
+            response = await client.get("/", headers={"If-None-Match": etag})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["ETag"] != etag
+            assert response.json() == data
+
+
+class TestCompressionMiddleware:
+    """Class for testing src.api_middlewares.CompressionMiddleware."""
+
+    @staticmethod
+    def get_app() -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=1024,
+            content_types=["application/json", "text/"],
+            levels={"gzip": 6, "br": 4, "zstd": 3},
+        )
+
+        @app.get("/")
+        async def get_data(size: int) -> list[int]:
+            return list(range(size))
+
+        @app.get("/stream")
+        async def stream() -> StreamingResponse:
+            async def lines():
+                for number in range(3):
+                    yield f"line {number}\n".encode()
+
+            return StreamingResponse(lines(), media_type="text/plain")
+
+        return app
+
+    @pytest.mark.parametrize(
+        ("encoding", "module"),
+        [("gzip", "zlib"), ("br", "brotli"), ("zstd", "zstandard")],
+    )
+    async def test_compression(self, encoding: str, module: str):
+        """Compresses bodies over the minimum size by `Accept-Encoding`."""
+
+        pytest.importorskip(module)
+        transport = httpx.ASGITransport(app=self.get_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get(
+                "/", params={"size": 1000}, headers={"Accept-Encoding": encoding}
+            )
+            assert response.headers["Content-Encoding"] == encoding
+            assert response.headers["Vary"] == "Accept-Encoding"
+            assert int(response.headers["Content-Length"]) < len(response.content)
+
+            response = await client.get(
+                "/", params={"size": 10}, headers={"Accept-Encoding": encoding}
+            )
+            assert "Content-Encoding" not in response.headers
+            assert response.json() == list(range(10))
+
+            response = await client.get(
+                "/", params={"size": 1000}, headers={"Accept-Encoding": "identity"}
+            )
+            assert "Content-Encoding" not in response.headers
+
+    async def test_streaming(self):
+        """Compresses a streaming body chunk by chunk, each chunk is decodable."""
+
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "root_path": "",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+            "server": ("test", 80),
+            "client": ("test", 123),
+        }
+        await self.get_app()(scope, receive, send)
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = [decompressor.decompress(m["body"]) for m in messages[1:]]
+        assert chunks[:3] == [b"line 0\n", b"line 1\n", b"line 2\n"]
+        assert b"".join(chunks) == b"line 0\nline 1\nline 2\n"
+        assert decompressor.eof
@@ -0,0 +1,609 @@
+import asyncio
+import uuid
+from contextlib import nullcontext
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, MetaData, String, Table, Uuid, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src import api_constants
+from src.api_exceptions import InvalidCursorException
+from src.cache import RepositoryCache
+from src.write_buffer import WriteBuffer
+from tests.conftest import faker
+from tests.integration.conftest import RepositoryTestModel, RepositoryTestRepository
+
+
+class CachedRepositoryTestRepository(RepositoryTestRepository):
+    cache = RepositoryCache(max_size=2)
+
+
+class RepositoryTestProjectionSchema(BaseModel):
+    id: uuid.UUID
+    number: int
+
+
+class BufferedRepositoryTestRepository(RepositoryTestRepository):
+    write_buffer = WriteBuffer(max_rows=3, max_delay=60)
+
+
+class VersionedRepositoryTestRepository(RepositoryTestRepository):
+    version_column = "version"
+
+
+class TestBaseRepository:
+    """Class for testing src.base_repository.BaseRepository."""
+
+    repository = RepositoryTestRepository
+
+    async def add_records(self, session: AsyncSession, count: int) -> None:
+        """Add `count` records with unique `number` values."""
+
+        await self.repository.add_bulk(
+            session,
+            [{"name": faker.name(), "number": number} for number in range(count)],
+            return_type=None,
+        )
+
+    # MARK: Create
+    async def test_add_bulk_copy(self, repository_session: AsyncSession):
+        """Can copy records from a generator in chunks."""
+
+        result = await self.repository.add_bulk_copy(
+            repository_session,
+            ({"name": faker.name(), "number": number} for number in range(5)),
+            chunk_size=2,
+        )
+        assert result is None
+        assert await self.repository.count(session=repository_session) == 5
+
+    async def test_add_bulk_copy_return_ids(self, repository_session: AsyncSession):
+        """Can copy records from an async generator and get their ids."""
+
+        async def create_data():
+            for number in range(5):
+                yield {"name": faker.name(), "number": number}
+
+        ids = await self.repository.add_bulk_copy(
+            repository_session, create_data(), chunk_size=2, return_type="id"
+        )
+        assert len(set(ids)) == 5
+        assert (
+            await self.repository.count(
+                RepositoryTestModel.id.in_(ids), session=repository_session
+            )
+            == 5
+        )
+
+    async def test_add_buffered(
+        self, repository_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Can merge buffered records into multi-row inserts and get their ids."""
+
+        write_buffer = BufferedRepositoryTestRepository.write_buffer
+        monkeypatch.setattr(
+            write_buffer, "session_factory", lambda: nullcontext(repository_session)
+        )
+
+        futures = [
+            BufferedRepositoryTestRepository.add_buffered(
+                {"name": faker.name(), "number": number}
+            )
+            for number in range(4)
+        ]
+        # The first 3 records fill the buffer, the last one waits for `max_delay`
+        ids = await asyncio.gather(*futures[:3])
+        assert len(write_buffer) == 1
+
+        await write_buffer.flush()
+        ids.append(await futures[3])
+
+        numbers = await repository_session.execute(
+            select(RepositoryTestModel.id, RepositoryTestModel.number)
+        )
+        assert dict(numbers.tuples().all()) == dict(zip(ids, range(4), strict=True))
+
+    async def test_add_buffered_error(
+        self, repository_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Resolves futures of buffered records to the error of a failed insert."""
+
+        write_buffer = BufferedRepositoryTestRepository.write_buffer
+        monkeypatch.setattr(
+            write_buffer, "session_factory", lambda: nullcontext(repository_session)
+        )
+
+        future = BufferedRepositoryTestRepository.add_buffered({"name": faker.name()})
+        await write_buffer.flush()
+        with pytest.raises(IntegrityError):
+            await future
+
+    # MARK: Upsert
+    async def test_upsert(self, repository_session: AsyncSession):
+        """Can insert a record and update it on conflict."""
+
+        record_id = uuid.uuid4()
+        created = await self.repository.upsert(
+            repository_session, {"id": record_id, "name": "created", "number": 1}
+        )
+        assert created is not None
+        assert created.name == "created"
+
+        updated = await self.repository.upsert(
+            repository_session,
+            {"id": record_id, "name": "updated", "number": 2},
+            update_policy={"number": RepositoryTestModel.number + 10},
+        )
+        assert updated is not None
+        assert updated.id == record_id
+        assert updated.name == "updated"
+        assert updated.number == 11
+
+        skipped = await self.repository.upsert(
+            repository_session,
+            {"id": record_id, "name": "skipped", "number": 3},
+            return_type="id_uuid",
+            on_conflict="nothing",
+        )
+        assert skipped is None
+
+    async def test_upsert_bulk(
+        self, repository_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Can upsert multiple records in chunks under the bind parameters limit."""
+
+        monkeypatch.setattr(api_constants, "POSTGRES_MAX_BIND_PARAMS", 6)
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": "old", "number": number} for number in range(3)],
+            return_type="id",
+        )
+
+        upsert_data = [
+            {"id": record_id, "name": "new", "number": 10} for record_id in ids
+        ] + [{"id": uuid.uuid4(), "name": "new", "number": 10}]
+        upserted = await self.repository.upsert_bulk(
+            repository_session,
+            upsert_data,
+            return_type="model",
+            update_policy={"number": "keep"},
+        )
+
+        assert len(upserted) == 4
+        assert all(instance.name == "new" for instance in upserted)
+        assert sorted(instance.number for instance in upserted) == [0, 1, 2, 10]
+
+    # MARK: Update
+    async def test_update_bulk_values(self, repository_session: AsyncSession):
+        """Can update records with `UPDATE ... FROM (VALUES ...)` in chunks."""
+
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": faker.name(), "number": number} for number in range(5)],
+            return_type="id",
+        )
+
+        instances = await self.repository.update_bulk(
+            repository_session,
+            [{"id": id, "number": number * 10} for number, id in enumerate(ids)],
+            return_type="model",
+            mode="values",
+            chunk_size=2,
+        )
+        assert {instance.id: instance.number for instance in instances} == {
+            id: number * 10 for number, id in enumerate(ids)
+        }
+
+    async def test_update_bulk_version(self, repository_session: AsyncSession):
+        """Checks and increments versions of updated records."""
+
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": faker.name(), "number": number} for number in range(2)],
+            return_type="id",
+        )
+
+        updated_ids = await self.repository.update_bulk(
+            repository_session,
+            [{"id": id, "name": "updated", "version": 1} for id in ids],
+            return_type="id",
+            mode="values",
+            version_column="version",
+        )
+        assert set(updated_ids) == set(ids)
+        versions = await repository_session.scalars(select(RepositoryTestModel.version))
+        assert set(versions) == {2}
+
+        with pytest.raises(StaleDataError):
+            await self.repository.update_bulk(
+                repository_session,
+                [{"id": ids[0], "name": "stale", "version": 1}],
+                mode="values",
+                version_column="version",
+            )
+
+    # MARK: Read
+    async def test_get_many_by_ids(self, repository_session: AsyncSession):
+        """Can get records by ids in the order of ids skipping missing ones."""
+
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": faker.name(), "number": number} for number in range(3)],
+            return_type="id",
+        )
+
+        instances = await self.repository.get_many_by_ids(
+            [ids[2], uuid.uuid4(), ids[0]], session=repository_session
+        )
+        assert [instance.id for instance in instances] == [ids[2], ids[0]]
+
+    async def test_statement_templates(self, repository_session: AsyncSession):
+        """Reuses statement templates of the model between calls."""
+
+        for number in range(2):
+            instance = await self.repository.add(
+                repository_session, {"name": faker.name(), "number": number}
+            )
+            assert await self.repository.get_many_by_ids(
+                [instance.id], session=repository_session
+            ) == [instance]
+        templates = dict(self.repository._statements)
+
+        assert await self.repository.count(session=repository_session) == 2
+        assert (
+            await self.repository.count(
+                RepositoryTestModel.number == 1, session=repository_session
+            )
+            == 1
+        )
+        assert self.repository._statements.items() >= templates.items()
+        assert "get_many_by_ids" not in RepositoryTestRepository.__base__._statements
+
+    async def test_get_loader(
+        self, repository_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Can merge concurrent lookups into a single query."""
+
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": faker.name(), "number": number} for number in range(3)],
+            return_type="id",
+        )
+        calls = []
+        get_many_by_ids = self.repository.get_many_by_ids
+
+        async def counting_get_many_by_ids(ids, session):
+            calls.append(ids)
+            return await get_many_by_ids(ids, session=session)
+
+        monkeypatch.setattr(
+            self.repository, "get_many_by_ids", counting_get_many_by_ids
+        )
+
+        loader = self.repository.get_loader(repository_session)
+        assert loader is self.repository.get_loader(repository_session)
+        missing_id = uuid.uuid4()
+        instances = await loader.load_all([ids[1], missing_id, ids[0], ids[1]])
+
+        assert len(calls) == 1
+        assert [
+            instance.id if instance is not None else None for instance in instances
+        ] == [ids[1], None, ids[0], ids[1]]
+
+    async def test_get_projection(self, repository_session: AsyncSession):
+        """Can select columns as rows, mappings or Pydantic schemas."""
+
+        ids = await self.repository.add_bulk(
+            repository_session,
+            [{"name": f"name {number}", "number": number} for number in range(3)],
+            return_type="id",
+        )
+        columns = (RepositoryTestModel.id, RepositoryTestModel.number)
+
+        row = await self.repository.get_one_or_none(
+            RepositoryTestModel.number == 1, session=repository_session, columns=columns
+        )
+        assert tuple(row) == (ids[1], 1)
+
+        mapping = await self.repository.get_exactly_one(
+            RepositoryTestModel.number == 2,
+            session=repository_session,
+            columns=columns,
+            row_type="mapping",
+        )
+        assert dict(mapping) == {"id": ids[2], "number": 2}
+
+        schemas = await self.repository.get_many_by_ids(
+            [ids[2], ids[0]],
+            session=repository_session,
+            columns=columns,
+            row_type=RepositoryTestProjectionSchema,
+        )
+        assert schemas == [
+            RepositoryTestProjectionSchema(id=ids[2], number=2),
+            RepositoryTestProjectionSchema(id=ids[0], number=0),
+        ]
+
+        assert not any(
+            isinstance(instance, RepositoryTestModel)
+            for instance in repository_session.identity_map.values()
+        )
+
+    # MARK: List
+    async def test_get_list_with_count(self, repository_session: AsyncSession):
+        """Can get a page and the total count, also beyond the last page."""
+
+        await self.add_records(repository_session, 5)
+        stmt = (
+            select(RepositoryTestModel)
+            .where(RepositoryTestModel.number > 0)
+            .order_by(RepositoryTestModel.number)
+        )
+
+        items, count = await self.repository.get_list_with_count(
+            repository_session, stmt, offset=1, limit=2
+        )
+        assert [item.number for item in items] == [2, 3]
+        assert count == 4
+
+        items, count = await self.repository.get_list_with_count(
+            repository_session, stmt, offset=10, limit=2
+        )
+        assert items == []
+        assert count == 4
+
+        rows, count = await self.repository.get_list_with_count(
+            repository_session,
+            select(RepositoryTestModel.number, RepositoryTestModel.name).order_by(
+                RepositoryTestModel.number
+            ),
+            limit=1,
+        )
+        assert rows[0][0] == 0
+        assert len(rows[0]) == 2
+        assert count == 5
+
+    # MARK: Delete
+    async def test_delete_in_batches(self, repository_session: AsyncSession):
+        """Can delete matching records in batches and report progress."""
+
+        await self.add_records(repository_session, 6)
+        progress = []
+
+        deleted = await self.repository.delete_in_batches(
+            RepositoryTestModel.number < 5,
+            session=repository_session,
+            batch_size=2,
+            on_progress=progress.append,
+        )
+        assert deleted == 5
+        assert progress == [2, 4, 5]
+        assert await self.repository.count(session=repository_session) == 1
+
+    async def test_archive_in_batches(self, repository_session: AsyncSession):
+        """Can move matching records to an archive table in batches."""
+
+        archive_table = Table(
+            "repository_test_model_archive",
+            MetaData(),
+            Column("id", Uuid, primary_key=True),
+            Column("name", String),
+            Column("number", Integer),
+        )
+        await repository_session.run_sync(
+            lambda sync_session: archive_table.create(sync_session.connection())
+        )
+        await self.add_records(repository_session, 3)
+
+        archived = await self.repository.archive_in_batches(
+            session=repository_session, archive_table=archive_table, batch_size=2
+        )
+        assert archived == 3
+        assert await self.repository.count(session=repository_session) == 0
+        numbers = await repository_session.scalars(select(archive_table.c.number))
+        assert sorted(numbers) == [0, 1, 2]
+
+    # MARK: Count
+    async def test_count_estimate(self, repository_session: AsyncSession):
+        """Can count rows exactly below the threshold and estimate them above it."""
+
+        await self.add_records(repository_session, 5)
+
+        assert await self.repository.count(
+            session=repository_session, estimate=True
+        ) == (5, True)
+
+        await repository_session.execute(
+            text(f"ANALYZE {RepositoryTestModel.__tablename__}")
+        )
+        assert await self.repository.count(
+            session=repository_session, estimate=True, exact_threshold=0
+        ) == (5, False)
+
+        count, is_exact = await self.repository.count(
+            RepositoryTestModel.id == uuid.uuid4(),
+            RepositoryTestModel.number >= 0,
+            session=repository_session,
+            estimate=True,
+            exact_threshold=0,
+        )
+        assert count >= 0
+        assert not is_exact
+
+    # MARK: Cursor
+    @pytest.mark.parametrize("asc", [True, False])
+    async def test_get_cursor_page(self, repository_session: AsyncSession, asc: bool):
+        """Can walk pages forward and backward with cursors."""
+
+        await self.add_records(repository_session, 7)
+
+        pages = []
+        cursor = None
+        while True:
+            items, next_cursor, prev_cursor = await self.repository.get_cursor_page(
+                session=repository_session,
+                order_by=RepositoryTestModel.number,
+                cursor=cursor,
+                limit=3,
+                asc=asc,
+            )
+            pages.append([item.number for item in items])
+            assert (prev_cursor is None) == (cursor is None)
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+
+        numbers = list(range(7)) if asc else list(range(6, -1, -1))
+        assert pages == [numbers[0:3], numbers[3:6], numbers[6:7]]
+
+        assert prev_cursor is not None
+        items, next_cursor, prev_cursor = await self.repository.get_cursor_page(
+            session=repository_session,
+            order_by=RepositoryTestModel.number,
+            cursor=prev_cursor,
+            limit=3,
+            asc=asc,
+        )
+        assert [item.number for item in items] == numbers[3:6]
+        assert next_cursor is not None
+        assert prev_cursor is not None
+
+    async def test_get_cursor_page_invalid_cursor(
+        self, repository_session: AsyncSession
+    ):
+        """Can not get a page with a malformed cursor."""
+
+        with pytest.raises(InvalidCursorException):
+            await self.repository.get_cursor_page(
+                session=repository_session, cursor="invalid"
+            )
+
+    # MARK: Cache
+    async def test_cache(self, repository_session: AsyncSession):
+        """Can serve lookups from the cache, invalidate them on update and evict them."""
+
+        repository = CachedRepositoryTestRepository
+        assert repository.cache is not None
+        repository.cache.invalidate()
+        ids = await repository.add_bulk(
+            repository_session,
+            [{"name": faker.name(), "number": number} for number in range(3)],
+            return_type="id",
+        )
+
+        first = await repository.get_one_or_none(
+            RepositoryTestModel.id == ids[0], session=repository_session
+        )
+        cached = await repository.get_one_or_none(
+            RepositoryTestModel.id == ids[0], session=repository_session
+        )
+        assert cached is first
+        assert repository.cache.stats()["hits"] == 1
+
+        await repository.update(
+            RepositoryTestModel.id == ids[0],
+            session=repository_session,
+            update_data={"name": "updated"},
+            return_type=None,
+        )
+        assert len(repository.cache) == 0
+        updated = await repository.get_one_or_none(
+            RepositoryTestModel.id == ids[0], session=repository_session
+        )
+        assert updated is not None
+        assert updated.name == "updated"
+
+        for record_id in ids[1:]:
+            await repository.get_exactly_one(
+                RepositoryTestModel.id == record_id, session=repository_session
+            )
+        assert len(repository.cache) == 2
+        assert repository.cache.stats()["evictions"] == 1
+
+    # MARK: Stream
+    async def test_stream(self, repository_session: AsyncSession):
+        """Can stream all matching records in order with a small `yield_per`."""
+
+        await self.add_records(repository_session, 5)
+
+        numbers = [
+            instance.number
+            async for instance in self.repository.stream(
+                RepositoryTestModel.number > 0,
+                session=repository_session,
+                order_by=[RepositoryTestModel.number],
+                yield_per=2,
+            )
+        ]
+        assert numbers == [1, 2, 3, 4]
+
+    async def test_stream_projection(self, repository_session: AsyncSession):
+        """Can stream selected columns."""
+
+        await self.add_records(repository_session, 3)
+
+        mappings = [
+            mapping
+            async for mapping in self.repository.stream(
+                session=repository_session,
+                order_by=[RepositoryTestModel.number],
+                columns=[RepositoryTestModel.number],
+                row_type="mapping",
+            )
+        ]
+        assert mappings == [{"number": 0}, {"number": 1}, {"number": 2}]
+
+    async def test_get_version(self, repository_session: AsyncSession):
+        """Version of records changes when a record or its `version_column` changes."""
+
+        await self.add_records(repository_session, 3)
+        where = RepositoryTestModel.number < 2
+        versioned = VersionedRepositoryTestRepository
+
+        assert (
+            await self.repository.get_version(
+                RepositoryTestModel.number > 10, session=repository_session
+            )
+            is None
+        )
+        row_version = await self.repository.get_version(
+            where, session=repository_session
+        )
+        column_version = await versioned.get_version(where, session=repository_session)
+
+        await self.repository.update(
+            RepositoryTestModel.number == 2,
+            session=repository_session,
+            update_data={"name": faker.name()},
+        )
+        assert (
+            await self.repository.get_version(where, session=repository_session)
+            == row_version
+        )
+
+        await self.repository.update(
+            RepositoryTestModel.number == 1,
+            session=repository_session,
+            update_data={"name": faker.name()},
+        )
+        assert (
+            await self.repository.get_version(where, session=repository_session)
+            != row_version
+        )
+        assert (
+            await versioned.get_version(where, session=repository_session)
+            == column_version
+        )
+
+        await self.repository.update(
+            RepositoryTestModel.number == 1,
+            session=repository_session,
+            update_data={"version": 2},
+        )
+        assert (
+            await versioned.get_version(where, session=repository_session)
+            != column_version
+        )
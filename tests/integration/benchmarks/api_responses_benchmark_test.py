@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.api_responses import FastJSONResponse
+from src.base_schemas import BaseListReadSchema
+from tests.conftest import faker
+from tests.integration.benchmarks.conftest import BenchmarkRecorder, measure
+
+pytestmark = pytest.mark.benchmark
+
+
+class ItemReadSchema(BaseModel):
+    id: uuid.UUID
+    name: str
+    number: int
+    created_at: datetime
+
+
+class ItemListReadSchema(BaseListReadSchema):
+    data: list[ItemReadSchema]
+
+
+def build_app(items: ItemListReadSchema) -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/default", response_model=None)
+    async def default() -> ItemListReadSchema:
+        return items
+
+    @app.get("/response-model", response_model=ItemListReadSchema)
+    async def response_model() -> ItemListReadSchema:
+        return items
+
+    @app.get("/default-class", response_model=None, response_class=FastJSONResponse)
+    async def default_class() -> ItemListReadSchema:
+        return items
+
+    @app.get("/fast", response_model=None)
+    async def fast() -> FastJSONResponse:
+        return FastJSONResponse(items)
+
+    return app
+
+
+# MARK: FastJSONResponse
+class TestFastJSONResponse:
+    """Compare `FastJSONResponse` with the `jsonable_encoder` + `json.dumps` path."""
+
+    @pytest.mark.parametrize("size", [1000, 10_000])
+    async def test_list_response(
+        self, benchmark_recorder: BenchmarkRecorder, size: int
+    ):
+        items = ItemListReadSchema(
+            count=size,
+            data=[
+                ItemReadSchema(
+                    id=uuid.uuid4(),
+                    name=faker.name(),
+                    number=faker.pyint(),
+                    created_at=datetime.now(timezone.utc),
+                )
+                for _ in range(size)
+            ],
+        )
+        transport = httpx.ASGITransport(app=build_app(items))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            expected = (await client.get("/default")).json()
+            timings = {}
+            for path in ("/default", "/response-model", "/default-class", "/fast"):
+                response = await client.get(path)
+                assert response.status_code == 200
+                assert response.json() == expected
+
+                async def request(path: str = path) -> None:
+                    await client.get(path)
+
+                timings[path] = await measure(
+                    request, rounds=10 if size < 10_000 else 3
+                )
+
+        print(
+            f"\n{size} items: "
+            + ", ".join(
+                f"{path} {timing * 1000:.1f}ms" for path, timing in timings.items()
+            )
+        )
+        for path, timing in timings.items():
+            benchmark_recorder.check(f"responses{path}[{size}]", timing)
+        assert timings["/fast"] < timings["/default"]
+        assert timings["/fast"] < timings["/response-model"]
@@ -0,0 +1,156 @@
+import uuid
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.conftest import faker
+from tests.integration.benchmarks.conftest import BenchmarkRecorder, measure
+from tests.integration.conftest import RepositoryTestModel, RepositoryTestRepository
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = (100, 1000, 10_000)
+
+
+class TestBaseRepositoryBenchmark:
+    """
+    Benchmarks of `src.base_repository.BaseRepository` operations.
+
+    `size` is the number of rows in the table for single record operations
+    and the number of records in a call for bulk operations.
+    """
+
+    repository = RepositoryTestRepository
+
+    def create_data(self, count: int) -> list[dict[str, Any]]:
+        """Return data of `count` records with unique `number` values."""
+
+        return [{"name": faker.name(), "number": number} for number in range(count)]
+
+    async def add_records(self, session: AsyncSession, count: int) -> list[uuid.UUID]:
+        """Add `count` records and return their ids."""
+
+        return await self.repository.add_bulk(
+            session=session, create_data=self.create_data(count), return_type="id"
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_add(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+    ):
+        await self.add_records(repository_session, size)
+        create_data = iter(self.create_data(101))
+
+        async def add() -> None:
+            await self.repository.add(
+                session=repository_session,
+                create_data=next(create_data),
+                return_type=None,
+            )
+
+        benchmark_recorder.check(
+            f"repository.add[{size}]", await measure(add, rounds=100)
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_add_bulk(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+    ):
+        create_data = self.create_data(size)
+
+        async def add_bulk() -> None:
+            await self.repository.add_bulk(
+                session=repository_session, create_data=create_data, return_type=None
+            )
+
+        benchmark_recorder.check(
+            f"repository.add_bulk[{size}]", await measure(add_bulk, rounds=10)
+        )
+
+    @pytest.mark.parametrize("mode", ["executemany", "values"])
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_update_bulk(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+        mode: str,
+    ):
+        ids = await self.add_records(repository_session, size)
+        update_data = [{"id": id, "name": faker.name()} for id in ids]
+
+        async def update_bulk() -> None:
+            await self.repository.update_bulk(
+                session=repository_session,
+                update_data=update_data,
+                mode=mode,  # type: ignore[arg-type]
+            )
+
+        benchmark_recorder.check(
+            f"repository.update_bulk_{mode}[{size}]",
+            await measure(update_bulk, rounds=10),
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_delete(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+    ):
+        ids = iter(await self.add_records(repository_session, size))
+
+        async def delete() -> None:
+            await self.repository.delete(
+                RepositoryTestModel.id == next(ids),
+                session=repository_session,
+                return_type=None,
+            )
+
+        benchmark_recorder.check(
+            f"repository.delete[{size}]", await measure(delete, rounds=50)
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_count(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+    ):
+        await self.add_records(repository_session, size)
+
+        async def count() -> None:
+            await self.repository.count(
+                RepositoryTestModel.number >= size // 2, session=repository_session
+            )
+
+        benchmark_recorder.check(
+            f"repository.count[{size}]", await measure(count, rounds=50)
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_check_if_exists(
+        self,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+        size: int,
+    ):
+        await self.add_records(repository_session, size)
+
+        async def check_if_exists() -> None:
+            await self.repository.check_if_exists(
+                RepositoryTestModel.number == size - 1, session=repository_session
+            )
+
+        benchmark_recorder.check(
+            f"repository.check_if_exists[{size}]",
+            await measure(check_if_exists, rounds=50),
+        )
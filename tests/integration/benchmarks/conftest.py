@@ -0,0 +1,99 @@
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Generator
+
+import pytest
+
+__all__ = ["BenchmarkRecorder", "measure", "percentiles"]
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+
+# MARK: Timing
+async def measure(func: Callable[[], Awaitable[object]], rounds: int) -> float:
+    """
+    Return the shortest duration of `func` over `rounds` runs after a warm-up run, in seconds.
+
+    The shortest run is the least affected by other processes, so it's the most stable
+    between runs to compare with baselines.
+    """
+
+    await func()
+    durations = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - started_at)
+
+    return min(durations)
+
+
+def percentiles(durations: list[float]) -> dict[str, float]:
+    """Return p50, p95 and p99 of `durations`."""
+
+    cut_points = statistics.quantiles(durations, n=100, method="inclusive")
+    return {"p50": cut_points[49], "p95": cut_points[94], "p99": cut_points[98]}
+
+
+# MARK: Baselines
+class BenchmarkRecorder:
+    """
+    Compare benchmark results with the baselines saved in `BASELINES_PATH`.
+
+    Baselines depend on the machine, save them with `--benchmark-save`
+    on the machine the benchmarks are gated on.
+
+    Attributes:
+        baselines (dict[str, float]): saved results by benchmark name.
+        threshold (float): relative regression from the baseline that fails a benchmark.
+        results (dict[str, float]): results of the current run by benchmark name.
+    """
+
+    def __init__(self, baselines: dict[str, float], threshold: float) -> None:
+        self.baselines = baselines
+        self.threshold = threshold
+        self.results: dict[str, float] = {}
+
+    def check(self, name: str, value: float, higher_is_better: bool = False) -> None:
+        """Record `value` of `name` and fail if it regressed past `threshold`."""
+
+        self.results[name] = value
+        baseline = self.baselines.get(name)
+        if not baseline:
+            return
+
+        if higher_is_better:
+            regression = (baseline - value) / baseline
+        else:
+            regression = (value - baseline) / baseline
+        if regression > self.threshold:
+            pytest.fail(
+                f"{name} regressed by {regression:.0%}: "
+                f"{value:.6g} against baseline {baseline:.6g}"
+            )
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(
+    request: pytest.FixtureRequest,
+) -> Generator[BenchmarkRecorder, None, None]:
+    """`BenchmarkRecorder` saving results as baselines at exit with `--benchmark-save`."""
+
+    baselines = {}
+    if BASELINES_PATH.exists():
+        baselines = json.loads(BASELINES_PATH.read_text())
+    recorder = BenchmarkRecorder(
+        baselines=baselines, threshold=request.config.getoption("--benchmark-threshold")
+    )
+
+    yield recorder
+
+    if request.config.getoption("--benchmark-save") and recorder.results:
+        baselines.update(
+            (name, float(f"{value:.4g}")) for name, value in recorder.results.items()
+        )
+        BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
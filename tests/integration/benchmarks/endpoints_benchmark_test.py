@@ -0,0 +1,145 @@
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import APIRouter, Depends, FastAPI
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api_middlewares import (
+    DBTimingMiddleware,
+    DisconnectMiddleware,
+    MetricsMiddleware,
+)
+from src.api_responses import FastJSONResponse
+from src.base_schemas import BaseListReadSchema
+from src.dependencies import get_session
+from tests.conftest import faker
+from tests.integration.benchmarks.conftest import BenchmarkRecorder, percentiles
+from tests.integration.conftest import RepositoryTestModel, RepositoryTestRepository
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 300
+
+
+class ItemReadSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: str
+    number: int
+    created_at: datetime
+
+
+class ItemListReadSchema(BaseListReadSchema):
+    data: list[ItemReadSchema]
+
+
+router = APIRouter(prefix="/items")
+
+
+@router.get(path="/{item_id}", response_model=None)
+async def get_item(
+    item_id: uuid.UUID, session: AsyncSession = Depends(get_session)
+) -> ItemReadSchema:
+    item = await RepositoryTestRepository.get_exactly_one(
+        RepositoryTestModel.id == item_id, session=session
+    )
+    return ItemReadSchema.model_validate(item)
+
+
+@router.get(path="", response_model=None)
+async def get_items(session: AsyncSession = Depends(get_session)) -> ItemListReadSchema:
+    items, count = await RepositoryTestRepository.get_list_with_count(
+        session=session,
+        stmt=select(RepositoryTestModel).order_by(RepositoryTestModel.id),
+    )
+    return ItemListReadSchema(
+        count=count, data=[ItemReadSchema.model_validate(item) for item in items]
+    )
+
+
+class TestEndpointsBenchmark:
+    """Latency percentiles and throughput of routes served through the middleware stack."""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def client(
+        self, repository_session: AsyncSession
+    ) -> AsyncGenerator[httpx.AsyncClient, None]:
+        app = FastAPI(default_response_class=FastJSONResponse)
+        app.include_router(router)
+        app.dependency_overrides[get_session] = lambda: repository_session
+        app.add_middleware(DisconnectMiddleware)
+        app.add_middleware(MetricsMiddleware)
+        app.add_middleware(DBTimingMiddleware)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+            yield async_client
+
+    async def run(
+        self,
+        client: httpx.AsyncClient,
+        benchmark_recorder: BenchmarkRecorder,
+        name: str,
+        paths: list[str],
+    ) -> None:
+        """Request `paths` one by one and check latency percentiles and throughput."""
+
+        await client.get(paths[0])
+        durations = []
+        started_at = time.perf_counter()
+        for path in paths:
+            request_started_at = time.perf_counter()
+            response = await client.get(path)
+            durations.append(time.perf_counter() - request_started_at)
+            assert response.status_code == 200
+        total_time = time.perf_counter() - started_at
+
+        for percentile, duration in percentiles(durations).items():
+            benchmark_recorder.check(f"endpoints.{name}.{percentile}", duration)
+        benchmark_recorder.check(
+            f"endpoints.{name}.rps", len(paths) / total_time, higher_is_better=True
+        )
+
+    async def test_get_item(
+        self,
+        client: httpx.AsyncClient,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+    ):
+        ids = await RepositoryTestRepository.add_bulk(
+            session=repository_session,
+            create_data=[
+                {"name": faker.name(), "number": number} for number in range(REQUESTS)
+            ],
+            return_type="id",
+        )
+
+        await self.run(
+            client, benchmark_recorder, "get_item", [f"/items/{id}" for id in ids]
+        )
+
+    async def test_get_items(
+        self,
+        client: httpx.AsyncClient,
+        repository_session: AsyncSession,
+        benchmark_recorder: BenchmarkRecorder,
+    ):
+        await RepositoryTestRepository.add_bulk(
+            session=repository_session,
+            create_data=[
+                {"name": faker.name(), "number": number} for number in range(1000)
+            ],
+            return_type=None,
+        )
+
+        await self.run(client, benchmark_recorder, "get_items", ["/items"] * REQUESTS)
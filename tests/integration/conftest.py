@@ -1,10 +1,18 @@
+import uuid
+from datetime import datetime
 from typing import AsyncGenerator
 
 import httpx
 import pytest_asyncio
 from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
 
+from src import api_constants
+from src.base_repository import BaseRepository
+from src.database import Base
 from src.dependencies import get_session
 
 
@@ -35,3 +43,54 @@ class BaseTestRouter:
             transport=transport, base_url="http://test"
         ) as async_client:
             yield async_client
+
+
+# MARK: TestRepository
+class RepositoryTestModel(Base):
+    """Model for testing `src.base_repository.BaseRepository`."""
+
+    __tablename__ = "repository_test_model"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True, server_default=text("gen_random_uuid()")
+    )
+    name: Mapped[str]
+    number: Mapped[int] = mapped_column(index=True)
+    version: Mapped[int] = mapped_column(server_default=text("1"))
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=api_constants.CURRENT_TIMESTAMP_UTC
+    )
+
+
+class RepositoryTestCreateSchema(BaseModel):
+    name: str
+    number: int
+
+
+class RepositoryTestUpdateSchema(BaseModel):
+    name: str | None = None
+    number: int | None = None
+
+
+class RepositoryTestRepository(
+    BaseRepository[
+        RepositoryTestModel, RepositoryTestCreateSchema, RepositoryTestUpdateSchema
+    ]
+):
+    model = RepositoryTestModel
+
+
+@pytest_asyncio.fixture(scope="function")
+async def repository_session(session: AsyncSession) -> AsyncSession:
+    """
+    `AsyncSession` with the `RepositoryTestModel` table created.
+
+    The table is created inside the test transaction and is dropped by its rollback.
+    """
+
+    await session.run_sync(
+        lambda sync_session: RepositoryTestModel.__table__.create(
+            sync_session.connection()
+        )
+    )
+    return session
@@ -0,0 +1,102 @@
+import re
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api_config import api_settings
+from src.api_exceptions import DeadlineExceededException
+from src.database import _create_engine, statement_deadline
+from src.dependencies import route_deadline
+
+
+class TestStatementDeadline:
+    """Class for testing src.database.statement_deadline."""
+
+    @staticmethod
+    async def get_statement_timeout(session: AsyncSession) -> str:
+        return await session.scalar(text("SHOW statement_timeout"))
+
+    async def test_statement_timeout(self, session: AsyncSession):
+        """Sets `statement_timeout` to the time left and restores it after the block."""
+
+        default_timeout = await self.get_statement_timeout(session)
+
+        async with statement_deadline(10):
+            timeout = await self.get_statement_timeout(session)
+            assert timeout.endswith("s") and timeout != default_timeout
+
+            async with statement_deadline(60):
+                assert await self.get_statement_timeout(session) == timeout
+
+        assert await self.get_statement_timeout(session) == default_timeout
+
+    async def test_deadline_exceeded(self, session: AsyncSession):
+        """Cancels a statement running past the deadline."""
+
+        with pytest.raises(DeadlineExceededException):
+            async with statement_deadline(0.1):
+                await session.execute(text("SELECT pg_sleep(1)"))
+
+    async def test_route_deadline(self, session: AsyncSession):
+        """Responds with `HTTP_504_GATEWAY_TIMEOUT` when a route exceeds its deadline."""
+
+        app = FastAPI()
+
+        @app.get("/", dependencies=[Depends(route_deadline(0.1))])
+        async def sleep() -> None:
+            await session.execute(text("SELECT pg_sleep(1)"))
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+
+class TestPreparedStatements:
+    """Class for testing prepared statements of src.database engines."""
+
+    async def test_pooler_statement_names(self, monkeypatch: pytest.MonkeyPatch):
+        """Names prepared statements uniquely for each engine."""
+
+        monkeypatch.setattr(api_settings, "DB_POOLER_PREPARED_STATEMENTS", True)
+        engines = [
+            _create_engine(
+                url=api_settings.DATABASE_URL,
+                application_name="test",
+                pool_name=f"test_{number}",
+            )
+            for number in range(2)
+        ]
+
+        names = []
+        try:
+            for engine in engines:
+                async with engine.connect() as conn:
+                    for _ in range(2):
+                        await conn.execute(text("SELECT 1"))
+                    names.append(
+                        set(
+                            await conn.scalars(
+                                text(
+                                    "SELECT name FROM pg_prepared_statements "
+                                    "WHERE statement = 'SELECT 1'"
+                                )
+                            )
+                        )
+                    )
+        finally:
+            for engine in engines:
+                await engine.dispose()
+
+        assert all(len(engine_names) == 1 for engine_names in names)
+        assert names[0] != names[1]
+        assert all(
+            re.fullmatch(r"__asyncpg_[0-9a-f]{12}_\d+__", name)
+            for engine_names in names
+            for name in engine_names
+        )
@@ -1,9 +1,14 @@
+import asyncio
+
 import httpx
+import pytest
 from fastapi import status
 
 from src.api_config import api_settings
+from src.api_lifecycle import app_lifecycle
+from src.healthcheck.readiness import readiness_probe
 from src.healthcheck.router import healthcheck_router
-from src.healthcheck.schemas import HealthCheckSchema
+from src.healthcheck.schemas import HealthCheckSchema, ReadinessSchema
 from tests.integration.conftest import BaseTestRouter
 
 
@@ -24,3 +29,45 @@ class TestHealthcheckRouter(BaseTestRouter):
         assert healthcheck_data.mode == api_settings.MODE
         assert healthcheck_data.version == api_settings.APP_VERSION
         assert healthcheck_data.status == "OK"
+
+    async def test_healthcheck_not_ready(
+        self, router_client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Reports the API as unavailable while it warms up or drains requests."""
+
+        for state in ("warming_up", "draining"):
+            monkeypatch.setattr(app_lifecycle, "state", state)
+
+            response = await router_client.get(url=self.base_route)
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    async def test_readiness(self, router_client: httpx.AsyncClient):
+        """Can check the database and the event loop."""
+
+        readiness_probe.clear()
+
+        response = await router_client.get(url=f"{self.base_route}/readiness")
+        assert response.status_code == status.HTTP_200_OK
+
+        readiness_data = ReadinessSchema(**response.json())
+        assert readiness_data.ready
+        assert readiness_data.database
+        assert readiness_data.replica_lags == []
+
+    async def test_readiness_single_flight(self, monkeypatch: pytest.MonkeyPatch):
+        """Concurrent checks share one in-flight check and its result is cached."""
+
+        readiness_probe.clear()
+        calls = 0
+        check = readiness_probe._check
+
+        async def counted_check():
+            nonlocal calls
+            calls += 1
+            return await check()
+
+        monkeypatch.setattr(readiness_probe, "_check", counted_check)
+
+        results = await asyncio.gather(*(readiness_probe.check() for _ in range(10)))
+        assert await readiness_probe.check() is results[0]
+        assert calls == 1
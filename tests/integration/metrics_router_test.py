@@ -0,0 +1,29 @@
+import httpx
+from fastapi import status
+
+from src.metrics.router import metrics_router
+from tests.integration.conftest import BaseTestRouter
+
+
+class TestMetricsRouter(BaseTestRouter):
+    """Class for testing src.metrics.router.metrics_router."""
+
+    router = metrics_router
+    base_route = metrics_router.prefix
+
+    # MARK: Get
+    async def test_metrics(self, router_client: httpx.AsyncClient):
+        """Can export pool, request and repository metrics in Prometheus format."""
+
+        response = await router_client.get(url=self.base_route)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+
+        for metric in (
+            "db_pool_checked_out",
+            "db_pool_checkout_wait_seconds",
+            "http_request_duration_seconds",
+            "http_requests_in_flight",
+            "repository_call_duration_seconds",
+        ):
+            assert f"# TYPE {metric} " in response.text